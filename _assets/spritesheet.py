@@ -1,12 +1,33 @@
 ''' This module creates the _sprites and draws the _board '''
 from __future__ import annotations
 import os
+import pickle
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from typing import Dict, Tuple
 import arcade
+from PIL import Image
+from _enums.color import Color
+from _enums.piece_type import PieceType
+from _board.board import PROMOTION_RANK
 
 piece_names = ["king", "queen", "bishop", "knight", "rook", "pawn"]
 color_names = ["white", "black"]
 
+# Fraction of a square's width a piece sprite fills
+_SPRITE_PAD: float = 0.88
+
+# Interned upper-case names of every Color and PieceType member, the same
+# strings the _textures keys are built from
+_UPPER_NAMES: Dict[object, str] = {
+    member: sys.intern(member.name.upper())
+    for enum_cls in (Color, PieceType) for member in enum_cls
+}
+
+# Decoded pixel data of every sprite, stored next to the PNGs
+TEXTURE_CACHE_NAME = ".texture_cache"
+
 class Spritesheet:
     """
     Simplified spritesheet loader for 12 unique PNGs.
@@ -22,26 +43,114 @@ class Spritesheet:
         self.current_theme = 1
 
         self._textures: Dict[Tuple[str, str, int], arcade.Texture] = {}
+        # Same textures keyed by (id(Color), id(PieceType), theme); enum
+        # members are singletons so their ids are stable
+        self._tex_flat: Dict[Tuple[int, int, int], arcade.Texture] = {}
         self._load_textures()
 
     def __repr__(self):
         return "_assets/_sprites"
 
     def _load_textures(self):
-        """Load all piece textures from disk for all themes"""
+        """
+        Load all piece textures from disk for all themes. PNGs are decoded
+        in parallel on first run; afterwards the decoded pixels are read
+        back from the texture cache as long as no sprite file changed.
+        """
+        # One directory listing answers every existence check and carries
+        # the stat results needed for the cache stamp
+        try:
+            with os.scandir(self.dir) as entries:
+                present = {entry.name: entry for entry in entries}
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Missing sprite directory: {self.dir}") from None
+
+        jobs = []
+        stamp = []
         for theme in range(1, self.themes + 1):
             for color in color_names:
                 for piece in piece_names:
                     filename = f"{color}_{piece}_{theme}.png"
                     full_path = os.path.join(self.dir, filename)
-                    if not os.path.exists(full_path):
+                    entry = present.get(filename)
+                    if entry is None:
                         raise FileNotFoundError(
                             f"Missing sprite image: {full_path}")
-                    tex = arcade.load_texture(full_path)
-                    self._textures[(color.upper(), piece.upper(), theme)] = tex
+                    jobs.append((color, piece, theme, full_path))
+                    stamp.append((full_path, entry.stat().st_mtime_ns))
+
+        paths = [job[3] for job in jobs]
+        stamp = tuple(stamp)
+
+        textures = self._read_texture_cache(stamp)
+        if textures is None:
+            # PIL releases the GIL while decoding, so threads overlap
+            try:
+                with ThreadPoolExecutor(max_workers=8) as pool:
+                    textures = list(pool.map(arcade.load_texture, paths))
+            except FileNotFoundError as err:
+                # A file vanished between the listing and the load
+                raise FileNotFoundError(
+                    f"Missing sprite image: {err.filename}") from err
+            self._write_texture_cache(stamp, textures)
+
+        for (color, piece, theme, _), tex in zip(jobs, textures):
+            self._textures[(sys.intern(color.upper()),
+                            sys.intern(piece.upper()), theme)] = tex
+            self._tex_flat[(id(Color[color.upper()]),
+                            id(PieceType[piece.upper()]),
+                            theme)] = tex
         print(f"[Spritesheet] Loaded {len(self._textures)} piece textures "
               "successfully.")
 
+    def _read_texture_cache(self, stamp):
+        """
+        Rebuild textures from the decoded-pixel cache
+
+        Args:
+            stamp: (path, mtime) of every sprite file, in load order
+        Returns:
+            List of textures in load order, or None if the cache is missing
+            or stale
+        """
+        cache_path = os.path.join(self.dir, TEXTURE_CACHE_NAME)
+        try:
+            with open(cache_path, "rb") as cache_file:
+                cached_stamp, images = pickle.load(cache_file)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+            return None
+
+        if cached_stamp != stamp:
+            return None
+
+        return [arcade.Texture(Image.frombytes(mode, size, data), hash=path)
+                for (path, _), (mode, size, data) in zip(stamp, images)]
+
+    def _write_texture_cache(self, stamp, textures):
+        """
+        Store the decoded pixels of freshly loaded textures
+
+        Args:
+            stamp: (path, mtime) of every sprite file, in load order
+            textures: Textures loaded from those files, in the same order
+        """
+        images = [(tex.image.mode, tex.image.size, tex.image.tobytes())
+                  for tex in textures]
+        cache_path = os.path.join(self.dir, TEXTURE_CACHE_NAME)
+        try:
+            with open(cache_path, "wb") as cache_file:
+                pickle.dump((stamp, images), cache_file,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            # A read-only install just decodes the PNGs every time
+            print(f"[Spritesheet] Could not write texture cache to "
+                  f"{cache_path}")
+
+    def all_textures(self) -> list[arcade.Texture]:
+        """Return every loaded piece texture across all themes"""
+        return list(self._textures.values())
+
     def next_white_theme(self):
         """Cycle to next white piece theme"""
         self.white_theme = (self.white_theme % self.themes) + 1
@@ -59,8 +168,21 @@ class Spritesheet:
         Retrieve the correct texture for a piece.
         Accepts either Enum objects or strings for color/piece_type.
         """
-        color_name = getattr(color, "name", str(color)).upper()
-        piece_name = getattr(piece_type, "name", str(piece_type)).upper()
+        # Fast path for enum members: a single int-tuple dict hit
+        theme = (self.white_theme if color is Color.WHITE
+                 else self.black_theme)
+        tex = self._tex_flat.get((id(color), id(piece_type), theme))
+        if tex is not None:
+            return tex
+
+        # Enum members map straight to their interned names; anything else
+        # (strings) is upper-cased once here
+        color_name = _UPPER_NAMES.get(color)
+        if color_name is None:
+            color_name = getattr(color, "name", str(color)).upper()
+        piece_name = _UPPER_NAMES.get(piece_type)
+        if piece_name is None:
+            piece_name = getattr(piece_type, "name", str(piece_type)).upper()
         theme = (self.white_theme if color_name == "WHITE"
                 else self.black_theme)
         return self._textures[(color_name, piece_name, theme)]
@@ -68,25 +190,94 @@ class Spritesheet:
 
 class ChessSprites:
     """Manages an Arcade SpriteList for all _board _pieces."""
-    def __init__(self, sheet: Spritesheet, cell_pixel_width: int):
+    def __init__(self, sheet: Spritesheet, cell_pixel_width: int,
+                 spatial_hash: bool = False):
         self.sheet = sheet
-        self.sprite_list = arcade.SpriteList(use_spatial_hash=True)
+        # At most 32 sprites: hash maintenance on every move costs more than
+        # a linear scan would ever save, so hashing is opt-in
+        self.sprite_list = arcade.SpriteList(use_spatial_hash=spatial_hash)
+        # Pack every theme's pieces into the list's atlas up front, so
+        # sprite creation and theme swaps never grow or re-upload it
+        self.sprite_list.preload_textures(sheet.all_textures())
+        # The sprite being dragged lives on its own, so following the mouse
+        # rewrites this one-sprite buffer instead of the board's
+        self.drag_layer = arcade.SpriteList(capacity=1)
         self.cell_pixel_width = cell_pixel_width
-        self._by_piece_id: Dict[int, arcade.Sprite] = {}
 
-    @staticmethod
-    def _tile_center(origin_x: int, origin_y: int, square: int,
-                      rank: int, file: int) -> tuple[float, float]:
-        return (
-            origin_x + file * square + square / 2,
-            origin_y + rank * square + square / 1.5,
-        )
+        # Incremental sync state, one slot per square indexed rank * 8 + file:
+        # the sprite drawn there and the piece it was drawn for. Pieces are
+        # held by reference and compared with `is`, so a slot can never be
+        # fooled by an id reused after its piece was freed.
+        self._sprite_at: list[arcade.Sprite | None] = [None] * 64
+        self._piece_at: list[object | None] = [None] * 64
+        self._synced_layout = None
+        # Layout plus the piece id on every tile as of the last sync
+        self._last_fingerprint: tuple | None = None
+
+        # Sprite centers for every board square, indexed rank * 8 + file,
+        # one table per (square, origin_x, origin_y, is_black) layout
+        self._centers: dict[tuple, list[tuple[float, float]]] = {}
+        # Sprite scale per square size; cell_pixel_width never changes
+        self._scale_for_square: dict[int, float] = {}
+
+    def _ensure_centers(self, square: int, origin_x: int, origin_y: int,
+                        is_black: bool) -> list[tuple[float, float]]:
+        """
+        Return the sprite center of every board square for the given layout.
+        Both orientations of a geometry are built together, so flipping the
+        board only swaps tables.
+
+        Args:
+            square: Size of each square in pixels
+            origin_x: X coordinate of board origin
+            origin_y: Y coordinate of board origin
+            is_black: Whether the board is drawn from black's side
+        Returns:
+            List of 64 (center_x, center_y) indexed rank * 8 + file
+        """
+        layout_key = (square, origin_x, origin_y, is_black)
+        centers = self._centers.get(layout_key)
+        if centers is None:
+            # x depends only on the file and y only on the rank, so compute
+            # the 8 values of each axis and take their outer product
+            xs = [origin_x + visual * square + square / 2
+                  for visual in range(8)]
+            ys = [origin_y + visual * square + square / 1.5
+                  for visual in range(8)]
+            white = [(x, y) for y in ys for x in xs]
+            # Rotating the board maps index i to 63 - i
+            black = white[::-1]
+            self._centers[(square, origin_x, origin_y, False)] = white
+            self._centers[(square, origin_x, origin_y, True)] = black
+            centers = black if is_black else white
+        return centers
+
+    def _make_sprite(self, piece, scale: float, center_x: float,
+                     center_y: float) -> arcade.Sprite:
+        """
+        Create a positioned sprite for a piece using the current theme
+
+        Args:
+            piece: Piece the sprite is drawn for
+            scale: Sprite scale for the current square size
+            center_x: X coordinate of the sprite center
+            center_y: Y coordinate of the sprite center
+        Returns:
+            The new sprite; the caller adds it to the sprite list
+        """
+        spr = arcade.Sprite(self.sheet.get_texture(piece.color,
+                                                   piece.piece_type),
+                            scale=scale)
+        spr.center_x = center_x
+        spr.center_y = center_y
+        return spr
 
     def build_from_board(self, board, square: int, origin_x: int,
                         origin_y: int, user_color=None):
         """
-        Build sprite list from board state with optional user color
-        for board orientation
+        Bring the sprite list in line with the board state with optional
+        user color for board orientation. The sprite list is kept alive;
+        only sprites of moved, new or removed pieces are touched.
 
         Args:
             board: Board object containing piece positions
@@ -95,54 +286,14 @@ class ChessSprites:
             origin_y: Y coordinate of board origin
             user_color: Color user is playing (affects board orientation)
         """
-        pad: float = 0.88
-        self.sprite_list = arcade.SpriteList(use_spatial_hash=True)
-        self._by_piece_id.clear()
-
         board.remove_prev()
-
-        desired_w = square * pad
-        scale = desired_w / self.cell_pixel_width
-
-        for rank in range(8):
-            for file in range(8):
-                tile = board.grid[rank][file]
-                if not tile.has_piece():
-                    continue
-
-                piece = tile.piece_here
-
-                # Convert board coordinates to visual coordinates based on
-                # user color
-                if (user_color and hasattr(user_color, 'name')
-                        and user_color.name == 'BLACK'):
-                    visual_file = 7 - file
-                    visual_rank = 7 - rank
-                else:
-                    visual_file = file
-                    visual_rank = rank
-
-                #Checks if piece already has sprite
-                if id(piece) in self._by_piece_id:
-                    spr = self._by_piece_id[id(piece)]
-                    spr.center_x, spr.center_y = self._tile_center(
-                        origin_x, origin_y, square, visual_rank, visual_file)
-
-                else:
-
-                    tex = self.sheet.get_texture(piece.color,
-                                                 piece.piece_type)
-
-                    spr = arcade.Sprite(tex, scale=scale)
-                    spr.center_x, spr.center_y = self._tile_center(
-                        origin_x, origin_y, square, visual_rank, visual_file)
-                    self.sprite_list.append(spr)
-                    self._by_piece_id[id(piece)] = spr
+        self.sync_from_board(board, square, origin_x, origin_y, user_color)
 
     def sync_from_board(self, board, square: int, origin_x: int,
                        origin_y: int, user_color=None):
         """
-        Sync sprite list with board state
+        Incrementally sync the sprite list with board state. Only sprites
+        whose tile changed are touched; the sprite list itself is kept.
 
         Args:
             board: Board object containing piece positions
@@ -151,56 +302,198 @@ class ChessSprites:
             origin_y: Y coordinate of board origin
             user_color: Color user is playing (affects board orientation)
         """
-        pad: float = 0.88
-        self.build_from_board(board, square, origin_x, origin_y, user_color)
-
-        desired_w = square * pad
-        scale = desired_w / self.cell_pixel_width
-
-        for rank in range(8):
-            for file in range(8):
-                tile = board.grid[rank][file]
-                if tile.has_piece():
-                    piece = tile.piece_here
-
-                    if id(piece) not in self._by_piece_id:
-                        # Convert board coordinates to visual coordinates
-                        # based on user color
-                        if (user_color and hasattr(user_color, 'name')
-                                and user_color.name == 'BLACK'):
-                            visual_file = 7 - file
-                            visual_rank = 7 - rank
-                        else:
-                            visual_file = file
-                            visual_rank = rank
-
-                        tex = self.sheet.get_texture(piece.color,
-                                                     piece.piece_type)
-
-                        spr = arcade.Sprite(tex, scale=scale)
-                        spr.center_x, spr.center_y = self._tile_center(
-                            origin_x, origin_y, square, visual_rank,
-                            visual_file)
-                        self.sprite_list.append(spr)
-                        self._by_piece_id[id(piece)] = spr
-                else:
-                    self.remove_sprite_by_piece(tile.piece_here)
+        self.drop()
+        # Color members are singletons, so one identity test settles the
+        # orientation for the whole sync
+        is_black = user_color is Color.BLACK
+        layout = (square, origin_x, origin_y, is_black)
+
+        # Nothing moved since the last sync: one tuple build and compare.
+        # Every id in the fingerprint belongs to a piece that still owns a
+        # sprite, so it stays alive and the id cannot be reused meanwhile.
+        fingerprint = (layout, tuple(id(tile.piece_here)
+                                     for row in board.grid for tile in row))
+        if fingerprint == self._last_fingerprint:
+            return
+        self._last_fingerprint = fingerprint
+
+        scale = self._scale_for_square.get(square)
+        if scale is None:
+            scale = square * _SPRITE_PAD / self.cell_pixel_width
+            self._scale_for_square[square] = scale
+
+        # Hoist attribute lookups out of the 64-tile loop
+        make_sprite = self._make_sprite
+        centers = self._ensure_centers(square, origin_x, origin_y, is_black)
+        sprite_at = self._sprite_at
+        piece_at = self._piece_at
+
+        # Any change of geometry or orientation moves every sprite
+        if layout != self._synced_layout:
+            self._synced_layout = layout
+            for idx, spr in enumerate(sprite_at):
+                if spr is not None:
+                    spr.scale = scale
+                    spr.center_x, spr.center_y = centers[idx]
+
+        # Free every slot whose piece changed; the sprites of pieces that
+        # left a slot are kept aside, keyed by piece id, for reuse below
+        loose: Dict[int, Tuple[arcade.Sprite, object]] = {}
+        needed = []
+        for idx, tile in enumerate(chain.from_iterable(board.grid)):
+            piece = tile.piece_here
+            old_piece = piece_at[idx]
+            if piece is old_piece:
+                continue
+            if old_piece is not None:
+                loose[id(old_piece)] = (sprite_at[idx], old_piece)
+                sprite_at[idx] = None
+            piece_at[idx] = piece
+            if piece is not None:
+                needed.append(idx)
+
+        # Fill the freed slots, moving a piece's old sprite when it has one;
+        # new sprites go into the list in one batch afterwards
+        new_sprites: list[arcade.Sprite] = []
+        for idx in needed:
+            piece = piece_at[idx]
+            entry = loose.pop(id(piece), None)
+            if entry is None:
+                # Genuinely new piece (initial setup or promotion)
+                spr = make_sprite(piece, scale, *centers[idx])
+                new_sprites.append(spr)
+            else:
+                spr = entry[0]
+                spr.center_x, spr.center_y = centers[idx]
+            sprite_at[idx] = spr
+        if new_sprites:
+            self.sprite_list.extend(new_sprites)
+
+        # Drop sprites for pieces that left the board since the last sync
+        for spr, _ in loose.values():
+            self.sprite_list.remove(spr)
+
+    def move_piece(self, board, from_pos: tuple[int, int],
+                   to_pos: tuple[int, int], square: int, origin_x: int,
+                   origin_y: int, user_color=None):
+        """
+        Follow a single move on the board by moving the mover's sprite and
+        dropping the one it captured, without scanning the board. On a
+        promotion the sprite just takes the new piece's texture. Castling,
+        en passant, a take-back that restores a capture or a changed layout
+        fall back to a full sync.
+
+        Args:
+            board: Board object the move was just made on
+            from_pos: (file, rank) the piece moved from
+            to_pos: (file, rank) the piece moved to
+            square: Size of each square in pixels
+            origin_x: X coordinate of board origin
+            origin_y: Y coordinate of board origin
+            user_color: Color user is playing (affects board orientation)
+        """
+        board.remove_prev()
+        self.drop()
+        layout = (square, origin_x, origin_y, user_color is Color.BLACK)
+        (from_file, from_rank), (to_file, to_rank) = from_pos, to_pos
+        src = from_rank * 8 + from_file
+        dst = to_rank * 8 + to_file
+        piece = self._piece_at[src]
+
+        # Only a piece that simply changed squares is followed
+        moved = board.grid[to_rank][to_file].piece_here
+        plain = (layout == self._synced_layout and piece is not None
+                 and board.grid[from_rank][from_file].piece_here is None
+                 and moved is not None and moved.color is piece.color)
+        if plain and moved is not piece:
+            # Another piece of the mover's color arriving can only be a
+            # pawn promoting on the last rank
+            plain = to_rank == PROMOTION_RANK[moved.color]
+        elif plain and piece.piece_type is PieceType.KING:
+            plain = abs(to_file - from_file) != 2
+        elif plain and piece.piece_type is PieceType.PAWN:
+            plain = (to_file == from_file
+                     or self._piece_at[dst] is not None)
+        if not plain:
+            self.sync_from_board(board, square, origin_x, origin_y,
+                                 user_color)
+            return
+
+        captured = self._sprite_at[dst]
+        if captured is not None:
+            self.sprite_list.remove(captured)
+
+        spr = self._sprite_at[src]
+        spr.center_x, spr.center_y = self._ensure_centers(*layout)[dst]
+        if moved is not piece:
+            spr.texture = self.sheet.get_texture(moved.color,
+                                                 moved.piece_type)
+        self._sprite_at[dst], self._piece_at[dst] = spr, moved
+        self._sprite_at[src] = self._piece_at[src] = None
+        # The next sync compares slot by slot once, then fingerprints again
+        self._last_fingerprint = None
+
+    def sprite_at(self, file: int, rank: int):
+        """
+        Get the sprite drawn for the piece on a square, as of the last sync
+
+        Args:
+            file: Board file (0-7)
+            rank: Board rank (0-7)
+        Returns:
+            The sprite on that square, or None if it is empty
+        """
+        return self._sprite_at[rank * 8 + file]
+
+    def lift(self, sprite: arcade.Sprite):
+        """
+        Move a sprite into the drag layer, drawn above every other piece
+
+        Args:
+            sprite: The sprite about to be dragged
+        """
+        self.drop()
+        self.sprite_list.remove(sprite)
+        self.drag_layer.append(sprite)
+
+    def drop(self):
+        """Put a lifted sprite back into the sprite list, if there is one"""
+        if self.drag_layer:
+            self.sprite_list.append(self.drag_layer.pop())
 
     def draw(self):
-        """Draw all sprites in the sprite list"""
+        """Draw all sprites in the sprite list, then the dragged one"""
         self.sprite_list.draw()
+        self.drag_layer.draw()
 
     def remove_sprite_by_piece(self, piece: "Piece"):
-        """Remove sprite for given piece from sprite list"""
-        sprite = self._by_piece_id.get(id(piece))
-        if sprite:
-            self._by_piece_id.pop(id(piece))
-            self.sprite_list.remove(sprite)
+        """
+        Remove sprite for given piece from sprite list
+
+        Args:
+            piece: Piece whose sprite should go; None is ignored
+        """
+        if piece is None:
+            return
+        self.drop()
+        # Rare path, so one scan of the 64 slots is fine. Compare with `is`:
+        # list.index would use the dataclass __eq__ and could match an
+        # identical piece on another square.
+        piece_at = self._piece_at
+        for idx, slot_piece in enumerate(piece_at):
+            if slot_piece is piece:
+                spr = self._sprite_at[idx]
+                self._sprite_at[idx] = None
+                piece_at[idx] = None
+                self._last_fingerprint = None
+                if spr is not None:
+                    self.sprite_list.remove(spr)
+                return
 
     def reload_theme(self, board, square, origin_x, origin_y,
                     user_color=None):
         """
-        Rebuild all sprites when theme is changed
+        Swap every sprite onto the current theme's texture, then sync
 
         Args:
             board: Board object containing piece positions
@@ -209,4 +502,9 @@ class ChessSprites:
             origin_y: Y coordinate of board origin
             user_color: Color user is playing (affects board orientation)
         """
+        self._last_fingerprint = None
+        get_tex = self.sheet.get_texture
+        for spr, piece in zip(self._sprite_at, self._piece_at):
+            if spr is not None:
+                spr.texture = get_tex(piece.color, piece.piece_type)
         self.build_from_board(board, square, origin_x, origin_y, user_color)
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+Precomputed attack bitboards for the non-sliding pieces.
+
+Squares are indexed rank * 8 + file, matching the board bitboards.
+"""
+from typing import Dict, List
+from _enums.color import Color
+
+KNIGHT_OFFSETS = ((2, 1), (2, -1), (-2, 1), (-2, -1),
+                  (1, 2), (1, -2), (-1, 2), (-1, -2))
+KING_OFFSETS = ((1, 0), (1, 1), (1, -1), (-1, -1),
+                (-1, 0), (-1, 1), (0, 1), (0, -1))
+
+
+def _offset_attacks(square: int, offsets) -> int:
+    """
+    Bitboard of the on-board squares reached by fixed offsets
+
+    Args:
+        square: Origin square index
+        offsets: (file offset, rank offset) pairs
+    Returns:
+        Bitboard of reached squares
+    """
+    attacks = 0
+    for file_offset, rank_offset in offsets:
+        file = (square & 7) + file_offset
+        rank = (square >> 3) + rank_offset
+        if 0 <= file <= 7 and 0 <= rank <= 7:
+            attacks |= 1 << (rank * 8 + file)
+    return attacks
+
+
+KNIGHT_ATTACKS: List[int] = [_offset_attacks(square, KNIGHT_OFFSETS)
+                             for square in range(64)]
+KING_ATTACKS: List[int] = [_offset_attacks(square, KING_OFFSETS)
+                           for square in range(64)]
+
+# Squares a pawn of each color captures on from every square
+PAWN_ATTACKS: Dict[Color, List[int]] = {
+    Color.WHITE: [_offset_attacks(square, ((1, 1), (-1, 1)))
+                  for square in range(64)],
+    Color.BLACK: [_offset_attacks(square, ((1, -1), (-1, -1)))
+                  for square in range(64)],
+}
+
+# Square a pawn of each color advances to from every square (one step)
+PAWN_PUSHES: Dict[Color, List[int]] = {
+    Color.WHITE: [_offset_attacks(square, ((0, 1),))
+                  for square in range(64)],
+    Color.BLACK: [_offset_attacks(square, ((0, -1),))
+                  for square in range(64)],
+}
+
+
+def _between(first: int, second: int) -> int:
+    """
+    Squares strictly between two squares on a shared rank, file or diagonal
+
+    Args:
+        first: One square index
+        second: The other square index
+    Returns:
+        Bitboard of the squares in between, 0 if the squares are not aligned
+    """
+    file_delta = (second & 7) - (first & 7)
+    rank_delta = (second >> 3) - (first >> 3)
+    if first == second or (file_delta and rank_delta
+                           and abs(file_delta) != abs(rank_delta)):
+        return 0
+    step_file = (file_delta > 0) - (file_delta < 0)
+    step_rank = (rank_delta > 0) - (rank_delta < 0)
+    between = 0
+    square = first + step_rank * 8 + step_file
+    while square != second:
+        between |= 1 << square
+        square += step_rank * 8 + step_file
+    return between
+
+
+# BETWEEN[a][b]: squares strictly between a and b when they are aligned
+BETWEEN: List[List[int]] = [[_between(first, second) for second in range(64)]
+                            for first in range(64)]
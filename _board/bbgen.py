@@ -0,0 +1,162 @@
+"""
+Integer-only move legality kernels.
+
+Everything here works on plain ints: bitboards indexed rank * 8 + file
+and per-color sequences of six bitboards in PIECE_ORDER. No board, tile
+or piece objects are touched, so testing a move never has to place and
+lift pieces on the grid.
+"""
+from typing import Sequence
+from _enums.color import Color
+from _enums.piece_type import PieceType
+from _board.attack_tables import (KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS,
+                                  BETWEEN)
+from _board.magics import rook_attacks, bishop_attacks
+
+# Index of each piece type in the per-color bitboard sequences
+PIECE_ORDER = (PieceType.PAWN, PieceType.KNIGHT, PieceType.BISHOP,
+               PieceType.ROOK, PieceType.QUEEN, PieceType.KING)
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+PIECE_INDEX = {piece_type: index
+               for index, piece_type in enumerate(PIECE_ORDER)}
+
+# Squares a pawn captures on, by [pawn is white][square]
+_PAWN_CAPTURES = (PAWN_ATTACKS[Color.BLACK], PAWN_ATTACKS[Color.WHITE])
+
+
+def square_attacked(square: int, attackers: Sequence[int],
+                    attackers_white: bool, occupancy: int,
+                    ep_square: int = -1) -> bool:
+    """
+    Check whether a side could move onto a square, cheapest tests first
+
+    Args:
+        square: Target square index
+        attackers: The attacking side's bitboards in PIECE_ORDER
+        attackers_white: Whether the attacking side is white
+        occupancy: Bitboard of all occupied squares
+        ep_square: En passant target square index, -1 if none
+    Returns:
+        True if the square is attacked, False otherwise
+    """
+    pawns = attackers[PAWN]
+    # A pawn attacks the squares a pawn of the other color on the target
+    # square would capture on
+    if _PAWN_CAPTURES[not attackers_white][square] & pawns:
+        return True
+
+    # Pawn.get_moves also offers the en passant square beside a pawn
+    # that just double-stepped
+    if pawns and ep_square >= 0:
+        step = 8 if attackers_white else -8
+        if ep_square + step == square:
+            file = ep_square & 7
+            beside = 0
+            if file > 0:
+                beside |= 1 << (ep_square - 1)
+            if file < 7:
+                beside |= 1 << (ep_square + 1)
+            if beside & pawns:
+                return True
+
+    if KNIGHT_ATTACKS[square] & attackers[KNIGHT]:
+        return True
+    if KING_ATTACKS[square] & attackers[KING]:
+        return True
+
+    queens = attackers[QUEEN]
+    if rook_attacks(square, occupancy) & (attackers[ROOK] | queens):
+        return True
+    if bishop_attacks(square, occupancy) & (attackers[BISHOP] | queens):
+        return True
+
+    return False
+
+
+def legal_targets(kind: int, from_square: int, targets: int,
+                  own: Sequence[int], enemy: Sequence[int], own_white: bool,
+                  ep_square: int = -1) -> int:
+    """
+    Keep the targets a piece can move to without leaving its king attacked
+
+    The move is only the piece moving and whatever stood on the target
+    disappearing, exactly as Board.check_if_move_into_check models it.
+
+    Args:
+        kind: Index of the moving piece's type in PIECE_ORDER
+        from_square: Square index the piece moves from
+        targets: Bitboard of candidate target squares
+        own: Moving side's bitboards in PIECE_ORDER
+        enemy: Other side's bitboards in PIECE_ORDER
+        own_white: Whether the moving side is white
+        ep_square: En passant target square index, -1 if none
+    Returns:
+        Bitboard of the legal targets
+    """
+    from_bit = 1 << from_square
+    own_occ = own[0] | own[1] | own[2] | own[3] | own[4] | own[5]
+    enemy_occ = enemy[0] | enemy[1] | enemy[2] | enemy[3] | enemy[4] | enemy[5]
+    kings = own[KING]
+
+    legal = 0
+    while targets:
+        low = targets & -targets
+        targets ^= low
+
+        if kind == KING:
+            kings_after = (kings ^ from_bit) | low
+        else:
+            kings_after = kings & ~low
+        # No king to attack means nothing to leave in check
+        if not kings_after:
+            legal |= low
+            continue
+        king_square = (kings_after & -kings_after).bit_length() - 1
+
+        occupancy = ((own_occ ^ from_bit) | low) | (enemy_occ & ~low)
+        if enemy_occ & low:
+            enemy_after = [bitboard & ~low for bitboard in enemy]
+        else:
+            enemy_after = enemy
+
+        if not square_attacked(king_square, enemy_after, not own_white,
+                               occupancy, ep_square):
+            legal |= low
+    return legal
+
+
+def pins_and_checkers(king_square: int, own_occ: int, enemy: Sequence[int],
+                      enemy_white: bool, occupancy: int):
+    """
+    Find the pieces giving check and the own pieces pinned to the king
+
+    Args:
+        king_square: Square index of the king
+        own_occ: Bitboard of the king's side
+        enemy: Other side's bitboards in PIECE_ORDER
+        enemy_white: Whether the other side is white
+        occupancy: Bitboard of all occupied squares
+    Returns:
+        Tuple of (checkers bitboard, {pinned square: allowed squares})
+    """
+    checkers = ((_PAWN_CAPTURES[not enemy_white][king_square] & enemy[PAWN])
+                | (KNIGHT_ATTACKS[king_square] & enemy[KNIGHT])
+                | (KING_ATTACKS[king_square] & enemy[KING]))
+    pin_rays = {}
+
+    # Sliders that would see the king on an empty board
+    queens = enemy[QUEEN]
+    sliders = ((rook_attacks(king_square, 0) & (enemy[ROOK] | queens))
+               | (bishop_attacks(king_square, 0) & (enemy[BISHOP] | queens)))
+    between_king = BETWEEN[king_square]
+    while sliders:
+        low = sliders & -sliders
+        sliders ^= low
+        ray = between_king[low.bit_length() - 1]
+        blockers = ray & occupancy
+        if not blockers:
+            checkers |= low
+        elif blockers & (blockers - 1) == 0 and blockers & own_occ:
+            # A lone own piece in between may only move along the ray
+            pin_rays[blockers.bit_length() - 1] = ray | low
+    return checkers, pin_rays
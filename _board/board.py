@@ -1,8 +1,11 @@
 """
 Board class which manages chess _board state and piece movements.
 """
-from typing import List
+import re
+from collections import OrderedDict, namedtuple
+from typing import Dict, List, Tuple
 from _pieces.piece import Piece, PieceType, Color
+from _enums.piece_value import PieceValue
 from _pieces.bishop import Bishop
 from _pieces.king import King
 from _pieces.knight import Knight
@@ -10,6 +13,57 @@ from _pieces.pawn import Pawn
 from _pieces.queen import Queen
 from _pieces.rook import Rook
 from _board.tile import Tile
+from _board.attack_tables import BETWEEN
+from _board.bbgen import (PIECE_ORDER, PIECE_INDEX, square_attacked,
+                          legal_targets, pins_and_checkers)
+from _board.zobrist import ZOBRIST_PIECE, ZOBRIST_EP, ZOBRIST_CASTLING
+
+# Material each piece type is worth, matching the pieces' piece_value
+PIECE_VALUES = {
+    PieceType.PAWN: PieceValue.PAWN.value,
+    PieceType.KNIGHT: PieceValue.KNIGHT.value,
+    PieceType.BISHOP: PieceValue.BISHOP.value,
+    PieceType.ROOK: PieceValue.ROOK.value,
+    PieceType.QUEEN: PieceValue.QUEEN.value,
+    PieceType.KING: 1000,
+}
+
+# FEN letter of every (color, piece type): upper case for white
+FEN_CHARS = {
+    (color, piece_type): (piece_type.value if color == Color.WHITE
+                          else piece_type.value.lower())
+    for color in Color for piece_type in PieceType
+}
+_EMPTY_RUN = re.compile(r"\.+")
+
+# Piece class and color of every FEN letter, the reverse of FEN_CHARS
+_PIECE_CLASSES = {
+    PieceType.PAWN: Pawn, PieceType.ROOK: Rook, PieceType.KNIGHT: Knight,
+    PieceType.BISHOP: Bishop, PieceType.QUEEN: Queen, PieceType.KING: King,
+}
+FEN_PIECES = {
+    char: (_PIECE_CLASSES[piece_type], color)
+    for (color, piece_type), char in FEN_CHARS.items()
+}
+# Rank a pawn of each color starts on; anywhere else it has moved
+PAWN_START_RANK = {Color.WHITE: 1, Color.BLACK: 6}
+# Rank a pawn of each color promotes on
+PROMOTION_RANK = {Color.WHITE: 7, Color.BLACK: 0}
+
+# Bitboard of the light squares, matching Tile.is_light_square
+LIGHT_SQUARES = sum(1 << (rank * 8 + file) for rank in range(8)
+                    for file in range(8) if (file + rank) % 2 == 1)
+
+# Most positions the transposition table remembers before dropping the
+# least recently used one
+TT_SIZE = 1 << 16
+
+# One move_history entry: what changed, plus the state it overwrote, so
+# the move can be taken back and replayed without a FEN per move.
+# castling is the CASTLE_ROOK_MOVES entry used, ep_target, has_moved and
+# material are the values from before the move, promo is the new queen.
+Move = namedtuple("Move", "piece frm to captured castling ep_target "
+                          "has_moved material promo")
 
 class Board:
     """
@@ -17,6 +71,14 @@ class Board:
     Manages piece placement, movement, and check detection
     """
 
+    # King destination (color, rank, file) -> rook from, rook to, log line
+    CASTLE_ROOK_MOVES = {
+        (Color.WHITE, 0, 6): ((7, 0), (5, 0), "White short castle"),
+        (Color.WHITE, 0, 2): ((0, 0), (3, 0), "White long castle"),
+        (Color.BLACK, 7, 6): ((7, 7), (5, 7), "Black short castle"),
+        (Color.BLACK, 7, 2): ((0, 7), (3, 7), "Black long castle"),
+    }
+
     def __init__(self) -> None:
         """Initialize the chess board with tiles and pieces in starting
         positions."""
@@ -26,7 +88,6 @@ class Board:
         self.grid: List[List[Tile]] = [[None for _ in range(8)]
                                        for _ in range(8)]
         self.selected_piece = None
-        self.checking_for_checks = False
         self.en_passant_target = None
         self.move_history = []
         self.current_index = -1
@@ -36,6 +97,33 @@ class Board:
         self.mate_color = None
         self.resigned = False
 
+        # One bitboard per (color, piece type) plus per-color occupancy.
+        # Bit rank * 8 + file is set when such a piece stands there; the
+        # grid stays the source the pieces and the GUI read from, and
+        # every change to it goes through _put_piece / _clear_square.
+        self.bb: Dict[Tuple[Color, PieceType], int] = {}
+        self.occ_color: Dict[Color, int] = {}
+        # Zobrist key of the piece placement, kept in step with the
+        # bitboards
+        self.zkey = 0
+        # _castling_flags() result, dropped whenever a piece is placed or
+        # lifted (every has_moved change comes with one)
+        self._castling = None
+        # Last check_draw answer with the material it was given for
+        self._draw = None
+
+        # Per-position cache of FEN strings and legal moves, keyed by
+        # position_key()
+        self._tt: OrderedDict[int, dict] = OrderedDict()
+
+        # (file, rank) of every tile carrying each marking. A handful of
+        # tiles are ever marked, so clearing and drawing walk these rather
+        # than all 64 tiles.
+        self.highlighted_tiles: set[tuple[int, int]] = set()
+        self.prev_tiles: set[tuple[int, int]] = set()
+        self.clicked_tiles: set[tuple[int, int]] = set()
+        self.check_tiles: set[tuple[int, int]] = set()
+
         # assign tile objects to None lists
         for rank in range(8):
             for file in range(8):
@@ -80,16 +168,138 @@ class Board:
         self.grid[7][2].piece_here = Bishop(Color.BLACK, (2, 7))
         self.grid[7][5].piece_here = Bishop(Color.BLACK, (5, 7))
 
-        #Sets initial board layout in previous move shower
-        self.move_history.append({
-            "Piece": None,
-            "From": None,
-            "To": None,
-            "Captured": None,
-            "FEN": self.board_state()
-        })
+        self._rebuild_bitboards()
+
+        #Index 0 of the move history stands for the initial layout
+        self.move_history.append(None)
         self.current_index = len(self.move_history) - 1
 
+    def _rebuild_bitboards(self):
+        """Recompute every bitboard from the pieces on the grid"""
+        self.bb = {(color, piece_type): 0
+                   for color in Color for piece_type in PieceType}
+        self.occ_color = {color: 0 for color in Color}
+        bb = self.bb
+        occ_color = self.occ_color
+        zkey = 0
+        for rank, row in enumerate(self.grid):
+            for file, tile in enumerate(row):
+                piece = tile.piece_here
+                if piece:
+                    square = rank * 8 + file
+                    key = (piece.color, piece.piece_type)
+                    bb[key] |= 1 << square
+                    occ_color[piece.color] |= 1 << square
+                    zkey ^= ZOBRIST_PIECE[key][square]
+        self.zkey = zkey
+        self._castling = None
+        self._draw = None
+
+    @property
+    def occupancy(self) -> int:
+        """Bitboard of every occupied square"""
+        return self.occ_color[Color.WHITE] | self.occ_color[Color.BLACK]
+
+    def _put_piece(self, piece: Piece, file: int, rank: int):
+        """
+        Place a piece on an empty tile and set its bitboard bit
+
+        Args:
+            piece: The piece to place
+            file: Target file (0-7)
+            rank: Target rank (0-7)
+        """
+        square = rank * 8 + file
+        key = (piece.color, piece.piece_type)
+        self.bb[key] |= 1 << square
+        self.occ_color[piece.color] |= 1 << square
+        self.zkey ^= ZOBRIST_PIECE[key][square]
+        self._castling = None
+        self.grid[rank][file].piece_here = piece
+
+    def _clear_square(self, file: int, rank: int, piece_type=None):
+        """
+        Remove whatever piece stands on a tile and clear its bitboard bit
+
+        Args:
+            file: File of the tile (0-7)
+            rank: Rank of the tile (0-7)
+            piece_type: Type the piece was placed as, if it has changed
+                        since (Piece.promote)
+        Returns:
+            The removed piece, None if the tile was empty
+        """
+        tile = self.grid[rank][file]
+        piece = tile.piece_here
+        if piece is not None:
+            square = rank * 8 + file
+            key = (piece.color, piece_type or piece.piece_type)
+            mask = ~(1 << square)
+            self.bb[key] &= mask
+            self.occ_color[piece.color] &= mask
+            self.zkey ^= ZOBRIST_PIECE[key][square]
+            self._castling = None
+            tile.piece_here = None
+        return piece
+
+    def _castling_flags(self) -> int:
+        """
+        Pack the has_moved flags King.get_moves consults for castling
+
+        Returns:
+            Six bits: white king, white h-rook, white a-rook, then black
+        """
+        if self._castling is not None:
+            return self._castling
+
+        flags = 0
+        for shift, color, row in ((0, Color.WHITE, 0), (3, Color.BLACK, 7)):
+            king_pos = self.find_king(color)
+            if (king_pos and not
+                    self.grid[king_pos[1]][king_pos[0]].piece_here.has_moved):
+                flags |= 1 << shift
+            for bit, file in ((1, 7), (2, 0)):
+                rook = self.grid[row][file].piece_here
+                if (rook and rook.piece_type is PieceType.ROOK
+                        and not rook.has_moved):
+                    flags |= 1 << (shift + bit)
+        self._castling = flags
+        return flags
+
+    def position_key(self) -> int:
+        """
+        Zobrist key of everything move generation depends on: placement,
+        en passant target and castling flags
+
+        Returns:
+            64-bit position key
+        """
+        key = self.zkey ^ ZOBRIST_CASTLING[self._castling_flags()]
+        if self.en_passant_target:
+            target_file, target_rank = self.en_passant_target
+            key ^= ZOBRIST_EP[target_rank * 8 + target_file]
+        return key
+
+    def _tt_entry(self) -> dict:
+        """
+        Transposition table entry of the current position, created empty
+        on first visit
+
+        Returns:
+            Dict with the cached "fen" (or None), "legal" moves by piece
+            position, and "moves", "enemy", "pins" and "checks" by color
+        """
+        key = self.position_key()
+        entry = self._tt.get(key)
+        if entry is None:
+            entry = self._tt[key] = {"fen": None, "legal": {}, "moves": {},
+                                     "enemy": {}, "pins": {}, "checks": {}}
+            if len(self._tt) > TT_SIZE:
+                self._tt.popitem(last=False)
+        else:
+            self._tt.move_to_end(key)
+        return entry
+
     def move_piece(self, file, rank):
         """
         Move the selected piece to the specified file and rank.
@@ -99,74 +309,23 @@ class Board:
         if not self.is_curr_pos():
             return
 
-        before_move = self.selected_piece.get_position()
-        before_move_rank = before_move[1]
-        before_move_file = before_move[0]
+        piece = self.selected_piece
+        before_move = piece.get_position()
+        material = self.material_differential
+        ep_target = self.en_passant_target
+        has_moved = getattr(piece, "has_moved", None)
 
-        captured_piece = self.grid[rank][file].piece_here
+        captured_piece, rook_move = self._apply_move(piece, file, rank)
         if captured_piece:
-            # very piece_value is enum, need the integer .value
-            piece_val = captured_piece.piece_value.value
-            # print(f"DEBUG: Captured {captured_piece.color}
-            # {captured_piece.piece_type} worth {piece_val}")
-            # print(f"DEBUG: Material Differential Before:
-            # {self.material_differential}")
             if captured_piece.color == Color.WHITE:
-                self.material_differential -= piece_val
                 print("WHITE captured")
             if captured_piece.color == Color.BLACK:
-                self.material_differential += piece_val
                 print("BLACK captured")
-
-            # print(f"DEBUG: Material Differential After:
-            # {self.material_differential}")
-            # Actually call the delete method
-            captured_piece.delete()
-
-        self.selected_piece.move((file, rank), self)
-
-        self.grid[rank][file].piece_here = self.selected_piece
-        self.grid[before_move_rank][before_move_file].piece_here = None
-
-        self.material_differential = self.calculate_material()
-        piece = self.selected_piece
-        # CASTLING
-        if piece.piece_type == PieceType.KING and before_move_file == 4:
-            if piece.color == Color.WHITE and rank == 0 and file == 6:
-                rook = self.grid[0][7].get_piece_here()
-                if rook:
-                    self.grid[0][5].piece_here = rook
-                    self.grid[0][7].piece_here = None
-                    rook.current_pos = (5, 0)
-                    print("White short castle")
-
-            elif piece.color == Color.WHITE and rank == 0 and file == 2:
-                rook = self.grid[0][0].get_piece_here()
-                if rook:
-                    self.grid[0][3].piece_here = rook
-                    self.grid[0][0].piece_here = None
-                    rook.current_pos = (3, 0)
-                    print("White long castle")
-
-            elif piece.color == Color.BLACK and rank == 7 and file == 6:
-                rook = self.grid[7][7].get_piece_here()
-                if rook:
-                    self.grid[7][5].piece_here = rook
-                    self.grid[7][7].piece_here = None
-                    rook.current_pos = (5, 7)
-                    print("Black short castle")
-
-            elif piece.color == Color.BLACK and rank == 7 and file == 2:
-                rook = self.grid[7][0].get_piece_here()
-                if rook:
-                    self.grid[7][3].piece_here = rook
-                    self.grid[7][0].piece_here = None
-                    rook.current_pos = (3, 7)
-                    print("Black long castle")
+        if rook_move:
+            print(rook_move[2])
 
         # Check if enemy is in check after move
-        piece = self.selected_piece
-        enemy_color = (Color.BLACK if piece.color == Color.WHITE
+        enemy_color = (Color.BLACK if piece.color is Color.WHITE
                       else Color.WHITE)
 
         # Clear all check indicators first
@@ -186,18 +345,127 @@ class Board:
               f"{before_move} to {(file, rank)}")
 
         #Add move to the move history list
-        self.move_history.append({
-            "Piece": piece,
-            "From": before_move,
-            "To": (file, rank),
-            "Captured": captured_piece,
-            "FEN": self.board_state()
-        })
+        self.move_history.append(Move(piece, before_move, (file, rank),
+                                      captured_piece, rook_move, ep_target,
+                                      has_moved, material, None))
 
         #Store the current position in move history
         self.current_index = len(self.move_history) - 1
         self.selected_piece = None
 
+    def _apply_move(self, piece: Piece, file: int, rank: int):
+        """
+        Play a piece's move on the grid and bitboards: capture, the
+        piece's own move bookkeeping and the castling rook
+
+        Args:
+            piece: The piece to move
+            file: Target file (0-7)
+            rank: Target rank (0-7)
+        Returns:
+            Tuple of (captured piece or None, CASTLE_ROOK_MOVES entry used
+            or None)
+        """
+        before_move_file, before_move_rank = piece.get_position()
+
+        captured_piece = self.grid[rank][file].piece_here
+        if captured_piece:
+            # King's piece_value is a plain int, so use the type table
+            piece_val = PIECE_VALUES[captured_piece.piece_type]
+            if captured_piece.color == Color.WHITE:
+                self.material_differential -= piece_val
+            else:
+                self.material_differential += piece_val
+            captured_piece.delete()
+
+        piece.move((file, rank), self)
+
+        self._clear_square(file, rank)
+        self._clear_square(before_move_file, before_move_rank)
+        self._put_piece(piece, file, rank)
+
+        # CASTLING
+        rook_move = None
+        if piece.piece_type is PieceType.KING and before_move_file == 4:
+            rook_move = self.CASTLE_ROOK_MOVES.get((piece.color, rank, file))
+            if rook_move:
+                (src_file, src_rank), (dst_file, dst_rank), _ = rook_move
+                rook = self.grid[src_rank][src_file].get_piece_here()
+                if rook:
+                    self._clear_square(src_file, src_rank)
+                    self._put_piece(rook, dst_file, dst_rank)
+                    rook.current_pos = (dst_file, dst_rank)
+                else:
+                    rook_move = None
+
+        return captured_piece, rook_move
+
+    def _take_back(self, move: Move):
+        """
+        Reverse a move from the history on the grid and bitboards
+
+        Args:
+            move: The history entry to reverse
+        """
+        piece = move.piece
+        file, rank = move.to
+
+        if move.castling:
+            (src_file, src_rank), (dst_file, dst_rank), _ = move.castling
+            rook = self._clear_square(dst_file, dst_rank)
+            self._put_piece(rook, src_file, src_rank)
+            rook.current_pos = (src_file, src_rank)
+
+        # Lifts the promoted queen when there is one
+        self._clear_square(file, rank)
+        if move.promo and piece.piece_type is not PieceType.PAWN:
+            # Piece.promote turned the pawn itself into a queen
+            piece.piece_type = PieceType.PAWN
+            piece.piece_value = PieceValue.PAWN
+
+        self._put_piece(piece, move.frm[0], move.frm[1])
+        piece.current_pos = move.frm
+        if move.has_moved is not None:
+            piece.has_moved = move.has_moved
+
+        if move.captured:
+            self._put_piece(move.captured, file, rank)
+            move.captured.current_pos = (file, rank)
+
+        self.en_passant_target = move.ep_target
+        self.material_differential = move.material
+
+    def step_back(self):
+        """
+        Show the position one move earlier in the history
+
+        Returns:
+            True if a move was taken back, False at the initial layout
+        """
+        if self.current_index <= 0:
+            return False
+        self._take_back(self.move_history[self.current_index])
+        self.current_index -= 1
+        self.selected_piece = None
+        return True
+
+    def step_forward(self):
+        """
+        Replay the next move in the history
+
+        Returns:
+            True if a move was replayed, False at the latest position
+        """
+        if self.is_curr_pos():
+            return False
+        self.current_index += 1
+        move = self.move_history[self.current_index]
+        self._apply_move(move.piece, move.to[0], move.to[1])
+        if move.promo:
+            self._place_promotion(move.promo, move.to[0], move.to[1])
+        self.selected_piece = None
+        return True
+
     def get_piece(self, piece: Piece):
         """Set the currently selected piece"""
         self.selected_piece = piece
@@ -221,25 +489,64 @@ class Board:
             legal_moves = self.get_all_legal(self.selected_piece)
             for move in legal_moves:
                 self.grid[move[1]][move[0]].highlight_move()
+            self.highlighted_tiles.update(legal_moves)
 
     def remove_highlights(self):
         """Remove all highlighted legal moves from the board"""
-        for rank in range(8):
-            for file in range(8):
-                self.grid[rank][file].clear_highlight()
+        for file, rank in self.highlighted_tiles:
+            self.grid[rank][file].clear_highlight()
+        self.highlighted_tiles.clear()
+
+    def mark_prev(self, file: int, rank: int):
+        """
+        Mark a tile as part of the previously made move
+
+        Args:
+            file: File of the tile (0-7)
+            rank: Rank of the tile (0-7)
+        """
+        self.grid[rank][file].prev_move()
+        self.prev_tiles.add((file, rank))
 
     def remove_prev(self):
         """Removes all highlighted tiles from the previously made move on
         the grid"""
-        for rank in range(8):
-            for file in range(8):
-                self.grid[rank][file].clear_prev()
+        for file, rank in self.prev_tiles:
+            self.grid[rank][file].clear_prev()
+        self.prev_tiles.clear()
+
+    def toggle_click(self, file: int, rank: int):
+        """
+        Mark a tile as clicked, or clear the mark if it already has one
+
+        Args:
+            file: File of the tile (0-7)
+            rank: Rank of the tile (0-7)
+        """
+        tile = self.grid[rank][file]
+        if tile.clicked:
+            tile.clear_click()
+            self.clicked_tiles.discard((file, rank))
+        else:
+            tile.click()
+            self.clicked_tiles.add((file, rank))
 
     def remove_check_indicators(self):
         """Remove all check indicators from the board"""
-        for rank in range(8):
-            for file in range(8):
-                self.grid[rank][file].clear_check()
+        for file, rank in self.check_tiles:
+            self.grid[rank][file].clear_check()
+        self.check_tiles.clear()
+
+    def marked_tiles(self) -> set[tuple[int, int]]:
+        """
+        Get every tile carrying any marking
+
+        Returns:
+            Set of (file, rank) of highlighted, previous move, clicked and
+            check tiles
+        """
+        return (self.highlighted_tiles | self.prev_tiles
+                | self.clicked_tiles | self.check_tiles)
 
     def highlight_king_in_check(self, color: Color):
         """
@@ -252,6 +559,7 @@ class Board:
             king_pos = self.find_king(color)
             if king_pos:
                 self.grid[king_pos[1]][king_pos[0]].set_check()
+                self.check_tiles.add(king_pos)
 
     def get_all_moves(self, color: Color):
         """
@@ -262,20 +570,68 @@ class Board:
         Returns:
             List of all possible player move positions
         """
-        all_moves = []
+        # The view and the bot both ask right after a move; one pass serves
+        cached = self._tt_entry()["moves"]
+        all_moves = cached.get(color)
+        if all_moves is None:
+            # Dict keys keep first-seen order and make duplicates free to skip
+            all_moves = {}
 
-        #Get moves for each piece
-        for rank in range(8):
-            for file in range(8):
-                piece = self.grid[rank][file].piece_here
-                if (piece and piece.color == color):
-                    curr = self.get_all_legal(piece)
+            #Get moves for each piece
+            for legal_moves in self._legal_by_piece(color):
+                all_moves.update(dict.fromkeys(legal_moves))
+
+            all_moves = cached[color] = list(all_moves)
+
+        return list(all_moves)
 
-                    for move in curr:
-                        if move not in all_moves:
-                            all_moves.append(move)
+    def _legal_by_piece(self, color: Color):
+        """
+        Generate the legal moves of each piece of a color in turn, so a
+        caller can stop as soon as it has seen enough
 
-        return all_moves
+        Args:
+            color: The color of the player
+        Yields:
+            List of legal move positions for one piece
+        """
+        for piece in self.get_pieces(color):
+            yield self.get_all_legal(piece)
+
+    def has_any_legal_move(self, color: Color) -> bool:
+        """
+        Check whether the player color has at least one legal move,
+        stopping at the first piece that can move
+
+        Args:
+            color: The color of the player
+        Returns:
+            True if any legal move exists, False otherwise
+        """
+        all_moves = self._tt_entry()["moves"].get(color)
+        if all_moves is not None:
+            return bool(all_moves)
+        return any(self._legal_by_piece(color))
+
+    def get_pieces(self, color: Color) -> List[Piece]:
+        """
+        Get the pieces of a color from its occupancy bitboard, so empty
+        tiles are never visited
+
+        Args:
+            color: The color of the pieces
+        Returns:
+            List of pieces in rank-then-file order, like a grid scan
+        """
+        grid = self.grid
+        pieces = []
+        occupied = self.occ_color[color]
+        while occupied:
+            low = occupied & -occupied
+            square = low.bit_length() - 1
+            pieces.append(grid[square >> 3][square & 7].piece_here)
+            occupied ^= low
+        return pieces
 
     def get_all_enemy_moves(self, color: Color):
         """
@@ -286,20 +642,18 @@ class Board:
         Returns:
             List of all possible enemy move positions
         """
-        all_moves = []
-
-        # Get moves for each piece
-        for rank in range(8):
-            for file in range(8):
-                piece = self.grid[rank][file].piece_here
-                if (piece and piece.color != color):
-                    curr = self.get_all_legal(piece)
+        # Callers only ask which squares the enemy reaches (is the king
+        # attacked), so the enemy's own king safety is not filtered for
+        cached = self._tt_entry()["enemy"]
+        all_moves = cached.get(color)
+        if all_moves is None:
+            all_moves = {}
+            for piece in self.get_pieces(color.opposite()):
+                all_moves.update(dict.fromkeys(piece.get_moves(self)))
 
-                    for move in curr:
-                        if move not in all_moves:
-                            all_moves.append(move)
+            all_moves = cached[color] = list(all_moves)
 
-        return all_moves
+        return list(all_moves)
 
     def find_king(self, color: Color):
         """
@@ -310,14 +664,13 @@ class Board:
         Returns:
             Tuple of (file, rank) or None if king not found
         """
-        for rank in range(8):
-            for file in range(8):
-                piece = self.grid[rank][file].piece_here
-                if (piece and piece.color == color
-                        and piece.piece_type.name == "KING"):
-                    return (file, rank)
+        kings = self.bb[(color, PieceType.KING)]
+        if not kings:
+            return None
 
-        return None
+        # Lowest set bit, the first king in rank-then-file order
+        square = (kings & -kings).bit_length() - 1
+        return (square & 7, square >> 3)
 
     def check_for_checks(self, color: Color):
         """
@@ -328,22 +681,99 @@ class Board:
         Returns:
             True if king is in check, False otherwise
         """
-        # prevent infinite recursion
-        if self.checking_for_checks:
-            return False
+        # Cached per position; every caller asks again after each move
+        cached = self._tt_entry()["checks"]
+        in_check = cached.get(color)
+        if in_check is None:
+            king_pos = self.find_king(color)
+            in_check = bool(king_pos) and self.square_attacked_by(
+                king_pos, color.opposite())
+            cached[color] = in_check
+        return in_check
 
-        self.checking_for_checks = True
+    def square_attacked_by(self, square: tuple[int, int], color: Color):
+        """
+        Check whether any piece of a color could move onto a square,
+        without generating moves. Cheapest piece tests run first.
 
-        try:
-            king_pos = self.find_king(color)
-            if not king_pos:
-                return False
+        Args:
+            square: The position to check (file, rank)
+            color: The color of the attacking pieces
+        Returns:
+            True if the square is attacked, False otherwise
+        """
+        file, rank = square
+        return square_attacked(rank * 8 + file, self._side_bitboards(color),
+                               color is Color.WHITE, self.occupancy,
+                               self._ep_square())
 
-            enemy_moves = self.get_all_enemy_moves(color)
-            return king_pos in enemy_moves
+    def _side_bitboards(self, color: Color) -> list[int]:
+        """
+        Bitboards of one color in the order the bbgen kernels expect
 
-        finally:
-            self.checking_for_checks = False
+        Args:
+            color: The color of the pieces
+        Returns:
+            List of six bitboards in PIECE_ORDER
+        """
+        bb = self.bb
+        return [bb[(color, piece_type)] for piece_type in PIECE_ORDER]
+
+    def _ep_square(self) -> int:
+        """Square index of the en passant target, -1 if there is none"""
+        if self.en_passant_target:
+            return self.en_passant_target[1] * 8 + self.en_passant_target[0]
+        return -1
+
+    def _legal_targets(self, piece: Piece, targets: int) -> int:
+        """
+        Filter a bitboard of targets down to those that keep the piece's
+        king safe
+
+        Args:
+            piece: The piece to move
+            targets: Bitboard of candidate target squares
+        Returns:
+            Bitboard of the legal targets
+        """
+        file, rank = piece.current_pos
+        return legal_targets(PIECE_INDEX[piece.piece_type], rank * 8 + file,
+                             targets, self._side_bitboards(piece.color),
+                             self._side_bitboards(piece.color.opposite()),
+                             piece.color is Color.WHITE, self._ep_square())
+
+    def compute_pins_and_checkers(self, color: Color):
+        """
+        Find the enemy pieces checking a king and the pieces pinned to it,
+        cached per position
+
+        Args:
+            color: The color of the king
+        Returns:
+            Tuple of (checkers bitboard, {pinned square index: bitboard of
+            squares it may still move to}), or None when the position needs
+            a full test per move: no single king, or the king stands on the
+            square Pawn.get_moves's en passant rule reaches
+        """
+        cached = self._tt_entry()["pins"]
+        if color in cached:
+            return cached[color]
+
+        pins = None
+        kings = self.bb[(color, PieceType.KING)]
+        king_square = kings.bit_length() - 1
+        enemy_white = color is not Color.WHITE
+        ep_square = self._ep_square()
+        if (kings and not kings & (kings - 1)
+                and (ep_square < 0
+                     or king_square != ep_square + (8 if enemy_white
+                                                    else -8))):
+            pins = pins_and_checkers(king_square, self.occ_color[color],
+                                     self._side_bitboards(color.opposite()),
+                                     enemy_white, self.occupancy)
+
+        cached[color] = pins
+        return pins
 
     def check_if_move_into_check(self, piece: Piece,
                                  new_pos: tuple[int, int]):
@@ -356,26 +786,9 @@ class Board:
         Returns:
             True if move would result in check, False otherwise
         """
-        current_pos = piece.current_pos
-        next_pos = self.grid[new_pos[1]][new_pos[0]]
-
-        # Store piece on target tile
-        captured_piece = next_pos.piece_here
-
-        # Simulate move
-        self.grid[current_pos[1]][current_pos[0]].piece_here = None
-        next_pos.piece_here = piece
-        piece.current_pos = new_pos
-
-        # See if moves into check
-        check = self.check_for_checks(piece.color)
-
-        # Undo move
-        self.grid[current_pos[1]][current_pos[0]].piece_here = piece
-        next_pos.piece_here = captured_piece
-        piece.current_pos = current_pos
-
-        return check
+        # Tested on the bitboards alone; the grid is left untouched
+        target = 1 << (new_pos[1] * 8 + new_pos[0])
+        return not self._legal_targets(piece, target)
 
     def get_all_legal(self, piece: Piece):
         """
@@ -386,14 +799,49 @@ class Board:
         Returns:
             List of legal move positions
         """
-        check_moves = piece.get_moves(self)
-        legal_moves = []
+        cached = self._tt_entry()["legal"]
+        legal_moves = cached.get(piece.current_pos)
+        if legal_moves is None:
+            check_moves = piece.get_moves(self)
+
+            targets = 0
+            for move in check_moves:
+                targets |= 1 << (move[1] * 8 + move[0])
+
+            pins = None
+            if piece.piece_type is not PieceType.KING:
+                pins = self.compute_pins_and_checkers(piece.color)
+
+            if pins is None:
+                # King moves (and odd positions) test every target
+                legal = self._legal_targets(piece, targets)
+            else:
+                checkers, pin_rays = pins
+                file, rank = piece.current_pos
+                legal = targets
+
+                # A pinned piece stays between its king and the pinner
+                pin_ray = pin_rays.get(rank * 8 + file)
+                if pin_ray is not None:
+                    legal &= pin_ray
+
+                # In check, only capturing or blocking a lone checker helps
+                if checkers:
+                    if checkers & (checkers - 1):
+                        legal = 0
+                    else:
+                        kings = self.bb[(piece.color, PieceType.KING)]
+                        checker = checkers.bit_length() - 1
+                        legal &= (BETWEEN[kings.bit_length() - 1][checker]
+                                  | checkers)
 
-        for move in check_moves:
-            if not self.check_if_move_into_check(piece, move):
-                legal_moves.append(move)
+            legal_moves = [move for move in check_moves
+                           if legal >> (move[1] * 8 + move[0]) & 1]
 
-        return legal_moves
+            cached[piece.current_pos] = legal_moves
+
+        # Callers get their own list; the cached one must stay intact
+        return list(legal_moves)
 
     def check_if_danger(self, square: tuple[int, int], enemy_moves: list,
                         visited_squares=None):
@@ -439,10 +887,11 @@ class Board:
             else:
                 check_square = (new_pos[0], new_pos[1] + 1)
 
-            self.grid[check_square[1]][check_square[0]].piece_here = None
+            self._clear_square(check_square[0], check_square[1])
 
-        self.grid[prev_pos[1]][prev_pos[0]].piece_here = None
-        self.grid[new_pos[1]][new_pos[0]].piece_here = piece
+        self._clear_square(prev_pos[0], prev_pos[1])
+        self._clear_square(new_pos[0], new_pos[1])
+        self._put_piece(piece, new_pos[0], new_pos[1])
         piece.current_pos = new_pos
         piece.has_moved = True
 
@@ -462,19 +911,25 @@ class Board:
         print(f"{resigning_color.name} resigned. {self.mate_color.name} "
               "wins!")
 
+    def _clear_marks(self):
+        """Forget every marked tile, after the tiles themselves were reset"""
+        self.highlighted_tiles.clear()
+        self.prev_tiles.clear()
+        self.clicked_tiles.clear()
+        self.check_tiles.clear()
+
     def reset_board(self):
         """
         Reset the board to the initial starting position
         """
         # Clear all tiles
-        for rank in range(8):
-            for file in range(8):
-                is_light = (file + rank) % 2 == 1
-                self.grid[rank][file] = Tile(file, rank, is_light)
+        for row in self.grid:
+            for tile in row:
+                tile.reset()
+        self._clear_marks()
 
         # Reset board state
         self.selected_piece = None
-        self.checking_for_checks = False
         self.en_passant_target = None
         self.move_history = []
         self.current_index = -1
@@ -493,21 +948,15 @@ class Board:
 
     def print_board(self):
         """Print a text representation of the _board to console (testing)"""
-        for rank in range(7, -1, -1):  # print rank 8 down to 1
-            row_str = ""
-            for file in range(8):  # left to right
-                piece = self.grid[rank][file].piece_here
-                if piece is None:
-                    row_str += ". "
-                else:
-                    symbol = piece.piece_type.value
-                    # uppercase for White, lowercase for Black
-                    if piece.color == Color.WHITE:
-                        row_str += symbol.upper() + " "
-                    else:
-                        row_str += symbol.lower() + " "
-            print(row_str)
-        print()
+        # Rank 8 down to 1, left to right, written out in one print
+        rows = []
+        for row in reversed(self.grid):
+            rows.append("".join(
+                ". " if tile.piece_here is None else
+                FEN_CHARS[(tile.piece_here.color,
+                           tile.piece_here.piece_type)] + " "
+                for tile in row))
+        print("\n".join(rows) + "\n")
 
     def board_state(self, active_color: Color = None):
         """
@@ -525,32 +974,25 @@ class Board:
         Returns:
             FEN string representing the _board position
         """
-        fen_string = ""
-        for rank in range(7, -1, -1):  # print rank 8 down to 1
-            fen_row = ""
-            empty_count = 0
-            for file in range(8):
-                piece = self.grid[rank][file].piece_here
-                if piece is None:
-                    empty_count += 1
-                    if file == 7:
-                        fen_row = fen_row + str(empty_count)
-                else:
-                    symbol = piece.piece_type.value
-                    if empty_count > 0:
-                        fen_row = fen_row + str(empty_count)
-                        empty_count = 0
-                        if piece.color == Color.WHITE:
-                            fen_row += symbol.upper()
-                        else:
-                            fen_row += symbol.lower()
-                    else:
-                        if piece.color == Color.WHITE:
-                            fen_row += symbol.upper()
-                        else:
-                            fen_row += symbol.lower()
-            fen_string += (fen_row + "/")
-        fen_string = fen_string[:-1]
+        # The placement part is cached per position
+        entry = self._tt_entry()
+        fen_string = entry["fen"]
+        if fen_string is None:
+            # Drop each bitboard's letter onto its squares, "." elsewhere
+            cells = ["."] * 64
+            for key, bitboard in self.bb.items():
+                char = FEN_CHARS[key]
+                while bitboard:
+                    low = bitboard & -bitboard
+                    cells[low.bit_length() - 1] = char
+                    bitboard ^= low
+
+            # Ranks 8 down to 1, then each run of empties becomes its length
+            fen_string = "/".join("".join(cells[rank * 8:rank * 8 + 8])
+                                  for rank in range(7, -1, -1))
+            fen_string = _EMPTY_RUN.sub(lambda run: str(len(run.group())),
+                                        fen_string)
+            entry["fen"] = fen_string
 
         # If active_color provided, return full FEN
         if active_color is not None:
@@ -587,21 +1029,12 @@ class Board:
         white_total = 0
         black_total = 0
 
-        for rank in range(8):
-            for file in range(8):
-                piece = self.grid[rank][file].piece_here
-
-                if not piece:
-                    continue
-
-                value = (piece.piece_value.value
-                        if hasattr(piece.piece_value, "value")
-                        else piece.piece_value)
-
-                if piece.color == Color.WHITE:
-                    white_total += value
-                else:
-                    black_total += value
+        # Piece count per bitboard times the value of that piece type
+        for piece_type, value in PIECE_VALUES.items():
+            white_total += (self.bb[(Color.WHITE, piece_type)].bit_count()
+                            * value)
+            black_total += (self.bb[(Color.BLACK, piece_type)].bit_count()
+                            * value)
 
         return white_total - black_total
 
@@ -613,14 +1046,11 @@ class Board:
             fen: fen representation of board layout
         '''
 
-        for file in range(8):
-            for rank in range(8):
-
-                #Check if tile is light
-                is_light = (rank + file) % 2 == 1
-
-                #Recreate the tiles
-                self.grid[rank][file] = Tile(file, rank, is_light)
+        #Empty the tiles; their colors never change
+        for row in self.grid:
+            for tile in row:
+                tile.reset()
+        self._clear_marks()
 
         #Split fen string apart per row
         rank_rows = fen.split('/')
@@ -629,47 +1059,39 @@ class Board:
         for rank_index, row in enumerate(reversed(rank_rows)):
             file_index = 0
 
-            #Find empty squares
+            #Letters are pieces, digits are runs of empty squares
             for char in row:
-                if char.isdigit():
+                entry = FEN_PIECES.get(char)
+                if entry is None:
                     file_index += int(char)
 
-                #If not digit, there is a piece here
                 else:
-                    color = Color.WHITE if char.isupper() else Color.BLACK
-                    piece_type_char = char.lower()
-
                     #Place piece
-                    piece_class = {
-                        'p': Pawn,
-                        'r': Rook,
-                        'n': Knight,
-                        'b': Bishop,
-                        'q': Queen,
-                        'k': King
-                    }[piece_type_char]
-
+                    piece_class, color = entry
                     piece = piece_class(color, (file_index, rank_index))
 
                     #Handle has_moved for pawn
-                    if isinstance(piece, Pawn):
-                        if ((piece.color == Color.WHITE
-                                and rank_index != 1)
-                                or (piece.color == Color.BLACK
-                                    and rank_index != 6)):
-                            piece.has_moved = True
+                    if (piece_class is Pawn
+                            and rank_index != PAWN_START_RANK[color]):
+                        piece.has_moved = True
 
                     #TODO - implement has_moved for rook and king as well
 
                     self.grid[rank_index][file_index].piece_here = piece
                     file_index += 1
 
+        self._rebuild_bitboards()
+
         #Calculate previous material difference
         self.material_differential = self.calculate_material()
 
         # Clear check indicators when loading a position
         self.remove_check_indicators()
 
+        # The loaded position starts a fresh move history
+        self.move_history = [None]
+        self.current_index = 0
+
     def on_mouse_release(self, x: float, y: float, button: int,
                         modifiers: int):
         """Handle mouse release events (placeholder for future
@@ -692,7 +1114,31 @@ class Board:
             file: The file of the pawn/queen
             rank: The rank of the pawn/queen
         """
-        self.grid[rank][file].piece_here = Queen(color, (file, rank))
+        queen = Queen(color, (file, rank))
+        self._place_promotion(queen, file, rank)
+
+        # Remember the queen so the move replays with the same piece
+        last_move = self.move_history[-1]
+        if last_move and last_move.to == (file, rank):
+            self.move_history[-1] = last_move._replace(promo=queen)
+
+    def _place_promotion(self, queen: Queen, file: int, rank: int):
+        """
+        Swap the pawn on a tile for its promoted queen
+
+        Args:
+            queen: The queen replacing the pawn
+            file: The file of the pawn/queen
+            rank: The rank of the pawn/queen
+        """
+        # The pawn may already report itself as a queen (Piece.promote),
+        # so remove it as the pawn it was placed as
+        self._clear_square(file, rank, PieceType.PAWN)
+        self._put_piece(queen, file, rank)
+
+        gain = PIECE_VALUES[PieceType.QUEEN] - PIECE_VALUES[PieceType.PAWN]
+        self.material_differential += (gain if queen.color == Color.WHITE
+                                       else -gain)
 
     def check_draw(self):
         """
@@ -702,23 +1148,45 @@ class Board:
         Returns:
             1 if draw condition met, 0 otherwise
         """
-        piece_count = 0
-
-        #If more than four pieces on the board, checkmate is possible
-        # (bishop/knight and king in each color invalidate checkmate)
-        for rank in range(8):
-            for file in range(8):
-                piece = self.grid[rank][file].piece_here
-                if piece:
-
-                    piece_count += 1
-
-                    if piece.piece_type in (PieceType.ROOK,
-                                           PieceType.QUEEN,
-                                           PieceType.PAWN):
-                        return 0
+        # Only material decides, and in play it changes only through a
+        # capture (piece count) or a promotion (pawn count); a bishop never
+        # leaves its square color. Until one happens, repeat the answer.
+        bb = self.bb
+        pawns = (bb[(Color.WHITE, PieceType.PAWN)]
+                 | bb[(Color.BLACK, PieceType.PAWN)])
+        material = (self.occupancy.bit_count(), pawns.bit_count())
+        if self._draw is None or self._draw[0] != material:
+            self._draw = (material, self._insufficient_material())
+        return self._draw[1]
+
+    def _insufficient_material(self) -> int:
+        """
+        Test the bitboards for material that can never deliver checkmate
 
-        if piece_count <= 4:
+        Returns:
+            1 if neither side can mate, 0 otherwise
+        """
+        bb = self.bb
+        # Any rook, queen or pawn on the board keeps checkmate possible
+        if (bb[(Color.WHITE, PieceType.PAWN)]
+                | bb[(Color.BLACK, PieceType.PAWN)]
+                | bb[(Color.WHITE, PieceType.ROOK)]
+                | bb[(Color.BLACK, PieceType.ROOK)]
+                | bb[(Color.WHITE, PieceType.QUEEN)]
+                | bb[(Color.BLACK, PieceType.QUEEN)]):
+            return 0
+
+        knights = (bb[(Color.WHITE, PieceType.KNIGHT)]
+                   | bb[(Color.BLACK, PieceType.KNIGHT)])
+        bishops = (bb[(Color.WHITE, PieceType.BISHOP)]
+                   | bb[(Color.BLACK, PieceType.BISHOP)])
+
+        # A lone knight, or bishops that all share one square color, can
+        # never cover the squares a mate needs (bare kings included)
+        if not bishops and knights & (knights - 1) == 0:
+            return 1
+        if not knights and (not bishops & LIGHT_SQUARES
+                            or not bishops & ~LIGHT_SQUARES):
             return 1
 
         return 0
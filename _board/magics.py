@@ -0,0 +1,139 @@
+"""
+Attack tables for the sliding pieces (rooks, bishops and queens).
+
+Squares are indexed rank * 8 + file, matching the board bitboards. Only
+the occupancy on a piece's relevant rays (the mask, edges excluded)
+affects its attacks, so each square keeps a table keyed by the masked
+occupancy. Entries are filled the first time an occupancy pattern is
+seen; a game only ever meets a small part of the full tables.
+"""
+from typing import Dict, List
+
+ROOK_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+BISHOP_DIRECTIONS = ((1, 1), (-1, 1), (1, -1), (-1, -1))
+
+
+def _ray_attacks(square: int, occupancy: int, directions) -> int:
+    """
+    Walk each ray from a square until it leaves the board or hits a piece
+
+    Args:
+        square: Origin square index
+        occupancy: Bitboard of occupied squares
+        directions: (file step, rank step) of every ray
+    Returns:
+        Bitboard of attacked squares, blockers included
+    """
+    attacks = 0
+    for step_file, step_rank in directions:
+        file = (square & 7) + step_file
+        rank = (square >> 3) + step_rank
+        while 0 <= file <= 7 and 0 <= rank <= 7:
+            bit = 1 << (rank * 8 + file)
+            attacks |= bit
+            if occupancy & bit:
+                break
+            file += step_file
+            rank += step_rank
+    return attacks
+
+
+def _relevant_mask(square: int, directions) -> int:
+    """
+    Squares whose occupancy can change a slider's attacks from a square
+
+    Args:
+        square: Origin square index
+        directions: (file step, rank step) of every ray
+    Returns:
+        Bitboard of the rays without their last square
+    """
+    mask = 0
+    for step_file, step_rank in directions:
+        file = (square & 7) + step_file
+        rank = (square >> 3) + step_rank
+        # The last square of a ray attacks the same whether it is
+        # occupied or not, so it is left out of the key
+        while (0 <= file + step_file <= 7
+               and 0 <= rank + step_rank <= 7):
+            mask |= 1 << (rank * 8 + file)
+            file += step_file
+            rank += step_rank
+    return mask
+
+
+ROOK_MASKS: List[int] = [_relevant_mask(square, ROOK_DIRECTIONS)
+                         for square in range(64)]
+BISHOP_MASKS: List[int] = [_relevant_mask(square, BISHOP_DIRECTIONS)
+                           for square in range(64)]
+
+# Per square: masked occupancy -> attack bitboard
+_ROOK_TABLE: List[Dict[int, int]] = [{} for _ in range(64)]
+_BISHOP_TABLE: List[Dict[int, int]] = [{} for _ in range(64)]
+
+
+def rook_attacks(square: int, occupancy: int) -> int:
+    """
+    Squares a rook on a square attacks
+
+    Args:
+        square: Rook square index
+        occupancy: Bitboard of all occupied squares
+    Returns:
+        Bitboard of attacked squares, blockers of both colors included
+    """
+    key = occupancy & ROOK_MASKS[square]
+    table = _ROOK_TABLE[square]
+    attacks = table.get(key)
+    if attacks is None:
+        attacks = table[key] = _ray_attacks(square, key, ROOK_DIRECTIONS)
+    return attacks
+
+
+def bishop_attacks(square: int, occupancy: int) -> int:
+    """
+    Squares a bishop on a square attacks
+
+    Args:
+        square: Bishop square index
+        occupancy: Bitboard of all occupied squares
+    Returns:
+        Bitboard of attacked squares, blockers of both colors included
+    """
+    key = occupancy & BISHOP_MASKS[square]
+    table = _BISHOP_TABLE[square]
+    attacks = table.get(key)
+    if attacks is None:
+        attacks = table[key] = _ray_attacks(square, key, BISHOP_DIRECTIONS)
+    return attacks
+
+
+def queen_attacks(square: int, occupancy: int) -> int:
+    """
+    Squares a queen on a square attacks
+
+    Args:
+        square: Queen square index
+        occupancy: Bitboard of all occupied squares
+    Returns:
+        Bitboard of attacked squares, blockers of both colors included
+    """
+    return rook_attacks(square, occupancy) | bishop_attacks(square, occupancy)
+
+
+def bits_to_squares(bitboard: int) -> list[tuple[int, int]]:
+    """
+    Convert a bitboard into board positions
+
+    Args:
+        bitboard: Bitboard to convert
+    Returns:
+        List of (file, rank) tuples, lowest square first
+    """
+    squares = []
+    while bitboard:
+        low = bitboard & -bitboard
+        square = low.bit_length() - 1
+        squares.append((square & 7, square >> 3))
+        bitboard ^= low
+    return squares
@@ -6,10 +6,11 @@ from typing import Optional
 from _pieces.piece import Piece
 from _enums.color import Color
 
-@dataclass()
+@dataclass(slots=True)
 class Tile:
     """
-    A single tile/square on the chess board
+    A single tile/square on the chess board. Slotted: 64 instances live
+    for the whole game and piece_here is read on every board scan.
 
     Attributes:
         file: The file (column) position (0-7)
@@ -90,6 +91,14 @@ class Tile:
         """Remove check marking from this tile"""
         self.in_check = False
 
+    def reset(self):
+        """Empty this tile and clear every marking on it"""
+        self.piece_here = None
+        self.highlighted = False
+        self.prev = False
+        self.clicked = False
+        self.in_check = False
+
     def get_piece_here(self):
         """
         Get the piece currently on this tile
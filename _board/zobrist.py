@@ -0,0 +1,27 @@
+"""
+Zobrist keys for hashing board positions.
+
+A position's key is the XOR of one random 64-bit number per piece on
+its square, plus numbers for the en passant target and for the
+has_moved flags that decide castling. Moving a piece updates the key
+with two XORs instead of rehashing the whole board.
+"""
+import random
+from typing import Dict, List, Tuple
+from _enums.color import Color
+from _enums.piece_type import PieceType
+
+# Fixed seed so keys are identical from run to run
+_rng = random.Random(0x5EED_C4E5)
+
+ZOBRIST_PIECE: Dict[Tuple[Color, PieceType], List[int]] = {
+    (color, piece_type): [_rng.getrandbits(64) for _ in range(64)]
+    for color in Color for piece_type in PieceType
+}
+
+# En passant target, by square index
+ZOBRIST_EP: List[int] = [_rng.getrandbits(64) for _ in range(64)]
+
+# One key per combination of the six castling flags (bit set = unmoved):
+# white king, white h-rook, white a-rook, then the same for black
+ZOBRIST_CASTLING: List[int] = [_rng.getrandbits(64) for _ in range(64)]
@@ -1,6 +1,7 @@
 import os
 from _enums.color import Color
 from _enums.piece_type import PieceType
+from _board.board import PROMOTION_RANK
 from stockfish import Stockfish
 from _game.import_stockfish import import_stockfish
 
@@ -23,15 +24,17 @@ class Bot:
         files = {"a": 0, "b": 1, "c": 2,
                  "d": 3, "e": 4, "f": 5,
                  "g": 6, "h": 7}
-        position = self.stockfish.set_fen_position(fen)
-        best_move = self.stockfish.get_best_move(position)
-        print(self.stockfish.is_fen_valid(fen=fen))
+        # One engine for the whole search, even if set_elo swaps it meanwhile
+        stockfish = self.stockfish
+        position = stockfish.set_fen_position(fen)
+        best_move = stockfish.get_best_move(position)
+        print(stockfish.is_fen_valid(fen=fen))
         print(best_move)
         start_file = files[best_move[0]]
         start_rank = best_move[1]
         move_to_file = files[best_move[2]]
         move_to_rank = best_move[3]
-        print(self.stockfish.get_parameters())
+        print(stockfish.get_parameters())
         return [(int(start_rank) - 1, start_file), (int(move_to_rank) - 1, move_to_file)]
 
 
@@ -52,6 +55,20 @@ class Bot:
 
         # Get best move from Stockfish
         bot_moves = self.next_move(fen=board.board_state(active_color=bot_color))
+        return self.apply_move(board, bot_color, bot_moves)
+
+    def apply_move(self, board, bot_color: Color, bot_moves: list[tuple[int, int]]) -> tuple[tuple[int, int], tuple[int, int]]:
+        """
+        Play a move chosen by next_move on the board.
+
+        Args:
+            board: The Board object to make the move on
+            bot_color: The color the bot is playing
+            bot_moves: [from_pos, to_pos] as returned by next_move
+
+        Returns:
+            Tuple of (from_pos, to_pos)
+        """
         from_pos = bot_moves[0]
         to_pos = bot_moves[1]
 
@@ -65,7 +82,7 @@ class Bot:
         piece = board.grid[final_rank][final_file].piece_here
 
         if (piece and piece.piece_type == PieceType.PAWN and
-                final_rank == (0 if bot_color == Color.BLACK else 7) and
+                final_rank == PROMOTION_RANK[bot_color] and
                 piece.color == bot_color):
             print(f"{bot_color.name} PAWN PROMOTED")
             piece.promote()
@@ -8,4 +8,4 @@ class Color(Enum):
 
     def opposite(self):
         """ Determine color of player and opponent """
-        return Color.BLACK if self == Color.WHITE else Color.WHITE
+        return Color.BLACK if self is Color.WHITE else Color.WHITE
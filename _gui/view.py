@@ -2,16 +2,21 @@
 GUI view module
 Contains the GameView class which handles rendering and user interaction
 """
-import time
+import math
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 import arcade
 from arcade import color as C
+from arcade.shape_list import (ShapeElementList, create_rectangle_filled,
+                               create_rectangle_outline)
 from pyglet.math import Vec2
+from PIL import Image, ImageDraw
 from arcade.experimental.crt_filter import CRTFilter
 import arcade.gui
 import arcade.gui.widgets.layout
 import arcade.gui.widgets.buttons
 from arcade.gui import UIManager, UIFlatButton
-from _board.board import Board
+from _board.board import Board, PROMOTION_RANK
 from _enums.color import Color
 from _enums.piece_type import PieceType
 from _assets.spritesheet import Spritesheet, ChessSprites
@@ -27,12 +32,211 @@ PREV_SQ = (125, 135, 150)
 SIDEPANEL_BG = (50, 50, 50)
 CLICK_SQ = (255, 165, 0)
 CHECK_SQ = (220, 20, 20)
+# Tile borders as fractions of the square: the middle square starts at
+# BORDER_1 in from the edge, the inner one at BORDER_2
+BORDER_1 = 0.07
+BORDER_2 = 0.14
+
+# Seconds the bot waits before answering; 0 still defers the reply to the
+# next frame, so the user's move is drawn first
+BOT_MOVE_DELAY = 0
+
+# Button styles, built once at import and shared by every GameView.
+# Difficulty buttons
+EASY_STYLE = {
+    "normal": UIFlatButton.UIStyle(
+        bg=arcade.color.DARK_GRAY,
+        font_color=(0, 150, 0),  # Darker green
+        border=(60, 60, 60),
+        border_width=2),
+    "hover": UIFlatButton.UIStyle(
+        font_color=(0, 150, 0),  # Darker green
+        bg=arcade.color.GRAY,
+        border=(60, 60, 60),
+        border_width=2),
+    "press": UIFlatButton.UIStyle(
+        font_color=(0, 150, 0),  # Darker green
+        bg=arcade.color.LIGHT_GRAY,
+        border=(60, 60, 60),
+        border_width=2),
+}
+MEDIUM_STYLE = {
+    "normal": UIFlatButton.UIStyle(
+        bg=arcade.color.DARK_GRAY,
+        font_color=(200, 100, 0),  # Darker orange
+        border=(60, 60, 60),
+        border_width=2),
+    "hover": UIFlatButton.UIStyle(
+        font_color=(200, 100, 0),  # Darker orange
+        bg=arcade.color.GRAY,
+        border=(60, 60, 60),
+        border_width=2),
+    "press": UIFlatButton.UIStyle(
+        font_color=(200, 100, 0),  # Darker orange
+        bg=arcade.color.LIGHT_GRAY,
+        border=(60, 60, 60),
+        border_width=2),
+}
+HARD_STYLE = {
+    "normal": UIFlatButton.UIStyle(
+        bg=arcade.color.DARK_GRAY,
+        font_color=(180, 0, 0),  # Darker red
+        border=(60, 60, 60),
+        border_width=2),
+    "hover": UIFlatButton.UIStyle(
+        font_color=(180, 0, 0),  # Darker red
+        bg=arcade.color.GRAY,
+        border=(60, 60, 60),
+        border_width=2),
+    "press": UIFlatButton.UIStyle(
+        font_color=(180, 0, 0),  # Darker red
+        bg=arcade.color.LIGHT_GRAY,
+        border=(60, 60, 60),
+        border_width=2),
+}
+
+# Theme buttons
+THEME_BUTTON_STYLE = {
+    "normal": UIFlatButton.UIStyle(
+        bg=arcade.color.DARK_GRAY,
+        font_color=arcade.color.BLACK,
+        border=(60, 60, 60),
+        border_width=2),
+    "hover": UIFlatButton.UIStyle(
+        bg=arcade.color.GRAY,
+        font_color=arcade.color.BLACK,
+        border=(60, 60, 60),
+        border_width=2),
+    "press": UIFlatButton.UIStyle(
+        bg=arcade.color.LIGHT_GRAY,
+        font_color=arcade.color.BLACK,
+        border=(60, 60, 60),
+        border_width=2),
+}
+
+# Color selection button, one style per side
+COLOR_BUTTON_STYLE_WHITE = {
+    "normal": UIFlatButton.UIStyle(
+        bg=arcade.color.WHITE,
+        font_color=arcade.color.BLACK,
+        border=(128, 128, 128),
+        border_width=2),
+    "hover": UIFlatButton.UIStyle(
+        bg=arcade.color.LIGHT_GRAY,
+        font_color=arcade.color.BLACK,
+        border=(128, 128, 128),
+        border_width=2),
+    "press": UIFlatButton.UIStyle(
+        bg=arcade.color.GRAY,
+        font_color=arcade.color.BLACK,
+        border=(128, 128, 128),
+        border_width=2),
+}
+
+COLOR_BUTTON_STYLE_BLACK = {
+    "normal": UIFlatButton.UIStyle(
+        bg=arcade.color.BLACK,
+        font_color=arcade.color.WHITE,
+        border=(128, 128, 128),
+        border_width=2),
+    "hover": UIFlatButton.UIStyle(
+        bg=arcade.color.LIGHT_GRAY,
+        font_color=arcade.color.WHITE,
+        border=(128, 128, 128),
+        border_width=2),
+    "press": UIFlatButton.UIStyle(
+        bg=arcade.color.GRAY,
+        font_color=arcade.color.WHITE,
+        border=(128, 128, 128),
+        border_width=2),
+}
+
+# Board index -> screen index along a file or rank, for each orientation.
+# Flipping is its own inverse, so the same table maps screen -> board too
+WHITE_VIEW = tuple(range(8))
+BLACK_VIEW = tuple(range(7, -1, -1))
+
+
+def view_table(user_color: Color) -> tuple:
+    """
+    Lookup table orienting files and ranks for the user's side
+
+    Args:
+        user_color: The color the user is playing
+    Returns:
+        Tuple mapping a board file or rank (0-7) to its screen position
+    """
+    return BLACK_VIEW if user_color is Color.BLACK else WHITE_VIEW
+
+
+def tile_colors(tile) -> tuple:
+    """
+    Colors of a tile's nested squares, given its current markings
+
+    Args:
+        tile: The Tile to color
+    Returns:
+        Tuple of (fill, alt): fill for the outer and inner squares, alt
+        for the middle one
+    """
+    fill = (LIGHT_SQ if tile.is_light_square
+            else DARK_SQ)
+    alt = DARK_SQ if fill == LIGHT_SQ else LIGHT_SQ
+
+    if tile.prev:
+        alt = PREV_SQ
+
+    if tile.highlighted:
+        alt = HIGHLIGHT_SQ
+
+    if tile.clicked:
+        alt = CLICK_SQ
+
+    if tile.in_check:
+        alt = CHECK_SQ
+
+    return fill, alt
+
+
+def _pixel_span(low: float, high: float) -> tuple[int, int]:
+    """
+    First and last pixel whose center lies inside [low, high], the pixels a
+    filled rectangle with those edges covers
+
+    Args:
+        low: Lower edge in pixels
+        high: Upper edge in pixels
+    Returns:
+        Tuple of (first, last) pixel, inclusive
+    """
+    return math.ceil(low - 0.5), math.floor(high - 0.5)
+
+
+def tile_texture(square: int, fill: tuple, alt: tuple) -> arcade.Texture:
+    """
+    Bake a tile's three nested squares into one texture, covering the
+    same pixels the separate rectangles did
+
+    Args:
+        square: Size of the tile in pixels
+        fill: Color of the outer and inner squares
+        alt: Color of the middle square
+    Returns:
+        square x square texture of the tile
+    """
+    image = Image.new("RGBA", (square, square), fill)
+    draw = ImageDraw.Draw(image)
+    for border, color in ((BORDER_1, alt), (BORDER_2, fill)):
+        first, last = _pixel_span(square * border, square - square * border)
+        draw.rectangle((first, first, last, last), fill=color)
+    return arcade.Texture(image, hash=f"tile-{square}-{fill}-{alt}")
 
 
-def draw_board(board: Board, origin_x: int, origin_y: int, square: int,
-               user_color: Color):
+def build_board_sprites(board: Board, origin_x: int, origin_y: int,
+                        square: int, user_color: Color) -> arcade.SpriteList:
     """
-    Draw the chess board with all tiles
+    Build the plain chess board as one sprite per tile, each a baked
+    texture of the tile's nested squares
 
     Args:
         board: The Board object to draw
@@ -40,174 +244,229 @@ def draw_board(board: Board, origin_x: int, origin_y: int, square: int,
         origin_y: Y coordinate of board origin
         square: Size of each square in pixels
         user_color: The color the user is playing (affects board orientation)
+    Returns:
+        SpriteList drawing the tiles in a single call
     """
+    # Transform coordinates based on user color
+    view = view_table(user_color)
 
-    border_1 = 0.07
-    border_2 = 0.14
+    light = tile_texture(square, LIGHT_SQ, DARK_SQ)
+    dark = tile_texture(square, DARK_SQ, LIGHT_SQ)
 
-    for rank in range(8):
-        for file in range(8):
-            # Transform coordinates based on user color
-            if user_color == Color.BLACK:
-                visual_file = 7 - file
-                visual_rank = 7 - rank
-            else:
-                visual_file = file
-                visual_rank = rank
-
-            x = origin_x + visual_file * square
-            y = origin_y + visual_rank * square
-            fill = (LIGHT_SQ if board.grid[rank][file].is_light_square
-                    else DARK_SQ)
-            alt = DARK_SQ if fill == LIGHT_SQ else LIGHT_SQ
-
-            inner_1 = square * border_1
-            inner_2 = square * border_2
-
-            if board.grid[rank][file].prev:
-                #arcade.draw_lbwh_rectangle_filled(x, y, square, square,
-                #                                  PREV_SQ)
-                alt = PREV_SQ
-
-            if board.grid[rank][file].highlighted:
-                #arcade.draw_lbwh_rectangle_filled(x, y, square, square,
-                #                                  HIGHLIGHT_SQ)
-                alt = HIGHLIGHT_SQ
-
-            if board.grid[rank][file].clicked:
-                #arcade.draw_lbwh_rectangle_filled(x, y, square, square,
-                #                                  CLICK_SQ)
-                alt = CLICK_SQ
-
-            if board.grid[rank][file].in_check:
-                alt = CHECK_SQ
-
-            arcade.draw_lbwh_rectangle_filled(x, y, square, square, fill)
-
-            #MIDDLE SQUARE
-            arcade.draw_lbwh_rectangle_filled(
-                x + inner_1, y + inner_1,
-                square - 2 * inner_1, square - 2 * inner_1,
-                alt
-            )
+    sprites = arcade.SpriteList()
+    for rank, row in enumerate(board.grid):
+        for file, tile in enumerate(row):
+            sprites.append(arcade.Sprite(
+                light if tile.is_light_square else dark,
+                center_x=origin_x + view[file] * square + square / 2,
+                center_y=origin_y + view[rank] * square + square / 2))
+    return sprites
 
-            #INNER SQUARE
-            arcade.draw_lbwh_rectangle_filled(
-                x + inner_2, y + inner_2,
-                square - 2 * inner_2, square - 2 * inner_2,
-                fill
-            )
 
+def build_mark_shapes(board: Board, origin_x: int, origin_y: int,
+                      square: int, user_color: Color) -> ShapeElementList:
+    """
+    Build the middle and inner squares of every marked tile (previous
+    move, highlight, click or check) as one batched shape list, drawn over
+    the plain board
 
-def draw_sidepanel(x: int, y: int, width: int, height: int, game: Game,
-                   board: Board, settings_mode: bool):
+    Args:
+        board: The Board object to draw
+        origin_x: X coordinate of board origin
+        origin_y: Y coordinate of board origin
+        square: Size of each square in pixels
+        user_color: The color the user is playing (affects board orientation)
+    Returns:
+        ShapeElementList drawing the marked tiles in a single call
+    """
+    # Transform coordinates based on user color
+    view = view_table(user_color)
+
+    # Sizes are the same for every tile; bind the loop's lookups locally
+    middle = square - 2 * (square * BORDER_1)
+    inner = square - 2 * (square * BORDER_2)
+    half = square / 2
+    light, dark = LIGHT_SQ, DARK_SQ
+    rect = create_rectangle_filled
+
+    shapes = ShapeElementList()
+    append = shapes.append
+    # Only the few marked tiles are visited, in a fixed order
+    for file, rank in sorted(board.marked_tiles()):
+        fill, alt = tile_colors(board.grid[rank][file])
+        if alt == (dark if fill == light else light):
+            continue
+
+        # The squares are nested around the tile's center
+        center_x = origin_x + view[file] * square + half
+        center_y = origin_y + view[rank] * square + half
+
+        #MIDDLE SQUARE
+        append(rect(center_x, center_y, middle, middle, alt))
+
+        #INNER SQUARE
+        append(rect(center_x, center_y, inner, inner, fill))
+    return shapes
+
+
+def button_shapes(left: float, bottom: float, width: float, height: float,
+                  fill, shapes: ShapeElementList = None) -> ShapeElementList:
     """
-    Draw the side panel with game information
+    Add a white-outlined filled button to a batched shape list
 
     Args:
-        x: X coordinate of panel
-        y: Y coordinate of panel
-        width: Width of panel
-        height: Height of panel
-        game: The Game object containing game state
-        board: The Board object containing board state
-        settings_mode: Whether to show settings panel or game panel
+        left: X coordinate of the button's left edge
+        bottom: Y coordinate of the button's bottom edge
+        width: Width of the button
+        height: Height of the button
+        fill: Fill color of the button
+        shapes: ShapeElementList to add to; a new one when None
+    Returns:
+        The shape list holding the button
+    """
+    if shapes is None:
+        shapes = ShapeElementList()
+    center_x = left + width / 2
+    center_y = bottom + height / 2
+    shapes.append(create_rectangle_filled(center_x, center_y, width, height,
+                                          fill))
+    shapes.append(create_rectangle_outline(center_x, center_y, width, height,
+                                           C.WHITE, 2))
+    return shapes
+
+
+class SidePanel:
+    """
+    Side panel with game information. Its labels are arcade.Text objects
+    made once; each frame only swaps their strings, which re-lays out a
+    label just when the string actually changed. The panel's rectangles
+    never move, so they are batched into shape lists up front.
     """
-    # Background
-    arcade.draw_lbwh_rectangle_filled(x, y, width, height, SIDEPANEL_BG)
-
-    # Settings button (always visible, top right) - always blue
-    settings_button_size = 35
-    settings_button_x = x + width - settings_button_size - 10
-    settings_button_y = y + height - settings_button_size - 10
-
-    settings_color = C.ROYAL_BLUE
-    arcade.draw_lbwh_rectangle_filled(settings_button_x, settings_button_y,
-                                      settings_button_size,
-                                      settings_button_size,
-                                      settings_color)
-    arcade.draw_lbwh_rectangle_outline(settings_button_x, settings_button_y,
-                                       settings_button_size,
-                                       settings_button_size,
-                                       C.WHITE, 2)
-    arcade.draw_text("⚙", x + width - settings_button_size // 2 - 10,
-                     y + height - settings_button_size // 2 - 10,
-                     C.WHITE, 20, anchor_x="center", anchor_y="center")
-
-    if not settings_mode:
-        # Current turn / game status
-        if not board.stalemate and not board.checkmate:
-            turn_text = ("White's Turn" if game.turn == Color.WHITE
-                        else "Black's Turn")
-        elif board.stalemate:
-            turn_text = "Stalemate!"
-        elif board.resigned:
-            turn_text = "Resignation!"
-        else:
-            turn_text = "Checkmate!"
-
-        arcade.draw_text(turn_text, x + width // 2, y + height - 100,
-                         C.WHITE, 16, anchor_x="center")
-
-        # Material differential / game result
-        material_diff = board.material_differential
-        if not board.checkmate and not board.stalemate:
-            if material_diff > 0:
-                material_msg = f"White + {material_diff}"
-            elif material_diff < 0:
-                material_msg = f"Black + {abs(material_diff)}"
-            else:
-                material_msg = "Even Material"
-        elif board.checkmate:
-            if board.mate_color == Color.WHITE:
-                material_msg = "White Wins!"
-            else:
-                material_msg = "Black Wins!"
-        else:
-            material_msg = "Draw :/"
 
-        arcade.draw_text(material_msg, x + width // 2, y + height - 140,
-                         C.WHITE, 14, anchor_x="center")
+    def __init__(self, x: int, y: int, width: int, height: int):
+        """
+        Create the panel's labels
+
+        Args:
+            x: X coordinate of panel
+            y: Y coordinate of panel
+            width: Width of panel
+            height: Height of panel
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+        # Background and the settings button (always visible, top right),
+        # drawn together in one call
+        settings_button_size = 35
+        self.base_shapes = ShapeElementList()
+        self.base_shapes.append(create_rectangle_filled(
+            x + width / 2, y + height / 2, width, height, SIDEPANEL_BG))
+        button_shapes(x + width - settings_button_size - 10,
+                      y + height - settings_button_size - 10,
+                      settings_button_size, settings_button_size,
+                      C.ROYAL_BLUE, self.base_shapes)
+
+        self.settings_text = arcade.Text(
+            "⚙", x + width - settings_button_size // 2 - 10,
+            y + height - settings_button_size // 2 - 10,
+            C.WHITE, 20, anchor_x="center", anchor_y="center")
+        self.turn_text = arcade.Text("", x + width // 2, y + height - 100,
+                                     C.WHITE, 16, anchor_x="center")
+        self.material_text = arcade.Text("", x + width // 2,
+                                         y + height - 140,
+                                         C.WHITE, 14, anchor_x="center")
 
         # Resign button OR New Game button (same position)
         button_width = 100
         button_height = 40
         button_x = x + width // 2 - button_width // 2
         button_y = 200
+        self.new_game_shapes = button_shapes(button_x, button_y, button_width,
+                                             button_height, C.DARK_GREEN)
+        self.resign_shapes = button_shapes(button_x, button_y, button_width,
+                                           button_height, C.DARK_RED)
+        self.new_game_text = arcade.Text("NEW GAME", x + width // 2,
+                                         button_y + button_height // 2,
+                                         C.WHITE, 11, anchor_x="center",
+                                         anchor_y="center", bold=True)
+        self.resign_text = arcade.Text("RESIGN", x + width // 2,
+                                       button_y + button_height // 2,
+                                       C.WHITE, 12, anchor_x="center",
+                                       anchor_y="center", bold=True)
+        self.color_label_text = arcade.Text("User plays as:", x + width // 2,
+                                            y + 80, C.WHITE, 14,
+                                            anchor_x="center")
+        self.settings_title_text = arcade.Text("SETTINGS", x + width // 2,
+                                               y + height - 100, C.WHITE, 18,
+                                               anchor_x="center", bold=True)
+
+    def draw(self, game: Game, board: Board, settings_mode: bool):
+        """
+        Draw the side panel with game information
+
+        Args:
+            game: The Game object containing game state
+            board: The Board object containing board state
+            settings_mode: Whether to show settings panel or game panel
+        """
+        # Background and settings button - always blue
+        self.base_shapes.draw()
+        self.settings_text.draw()
+
+        if not settings_mode:
+            # Current turn / game status
+            if not board.stalemate and not board.checkmate:
+                turn_text = ("White's Turn" if game.turn == Color.WHITE
+                            else "Black's Turn")
+            elif board.stalemate:
+                turn_text = "Stalemate!"
+            elif board.resigned:
+                turn_text = "Resignation!"
+            else:
+                turn_text = "Checkmate!"
+
+            self.turn_text.text = turn_text
+            self.turn_text.draw()
+
+            # Material differential / game result
+            material_diff = board.material_differential
+            if not board.checkmate and not board.stalemate:
+                if material_diff > 0:
+                    material_msg = f"White + {material_diff}"
+                elif material_diff < 0:
+                    material_msg = f"Black + {abs(material_diff)}"
+                else:
+                    material_msg = "Even Material"
+            elif board.checkmate:
+                if board.mate_color == Color.WHITE:
+                    material_msg = "White Wins!"
+                else:
+                    material_msg = "Black Wins!"
+            else:
+                material_msg = "Draw :/"
+
+            self.material_text.text = material_msg
+            self.material_text.draw()
+
+            # Resign button OR New Game button (same position)
+            if board.checkmate or board.stalemate or board.resigned:
+                # NEW GAME BUTTON
+                self.new_game_shapes.draw()
+                self.new_game_text.draw()
+            else:
+                # RESIGN BUTTON
+                self.resign_shapes.draw()
+                self.resign_text.draw()
+
+            # Color selection label (button is managed by UIManager)
+            self.color_label_text.draw()
 
-        if board.checkmate or board.stalemate or board.resigned:
-            # NEW GAME BUTTON
-            arcade.draw_lbwh_rectangle_filled(button_x, button_y,
-                                              button_width, button_height,
-                                              C.DARK_GREEN)
-            arcade.draw_lbwh_rectangle_outline(button_x, button_y,
-                                               button_width, button_height,
-                                               C.WHITE, 2)
-            arcade.draw_text("NEW GAME", x + width // 2,
-                            button_y + button_height // 2,
-                            C.WHITE, 11, anchor_x="center",
-                            anchor_y="center", bold=True)
         else:
-            # RESIGN BUTTON
-            arcade.draw_lbwh_rectangle_filled(button_x, button_y,
-                                              button_width, button_height,
-                                              C.DARK_RED)
-            arcade.draw_lbwh_rectangle_outline(button_x, button_y,
-                                               button_width, button_height,
-                                               C.WHITE, 2)
-            arcade.draw_text("RESIGN", x + width // 2,
-                            button_y + button_height // 2,
-                            C.WHITE, 12, anchor_x="center",
-                            anchor_y="center", bold=True)
-
-        # Color selection label (button is managed by UIManager)
-        arcade.draw_text("User plays as:", x + width // 2, y + 80,
-                         C.WHITE, 14, anchor_x="center")
-
-    else:
-        # settings panel
-        arcade.draw_text("SETTINGS", x + width // 2, y + height - 100,
-                         C.WHITE, 18, anchor_x="center", bold=True)
+            # settings panel
+            self.settings_title_text.draw()
 
 
 class GameView(arcade.View):
@@ -226,13 +485,9 @@ class GameView(arcade.View):
             title: Window title (unused but required by parent)
         """
         super().__init__()
-        self.crt_filter = CRTFilter(self.window.width, self.window.height,
-                                    resolution_down_scale=1.0,
-                                    hard_scan=-2.0,
-                                    hard_pix=-2.0,
-                                    display_warp=Vec2(0.0, 0.0),
-                                    mask_dark=0.5,
-                                    mask_light=1.2)
+        # Made on first use: most sessions never turn the filter on, so it
+        # costs no framebuffer or shader compile until then
+        self.crt_filter = None
 
         self.filter_on = False
         self.settings_mode = False  # Track if settings panel is open
@@ -244,11 +499,37 @@ class GameView(arcade.View):
         self.board = Board()
         self.game = Game()
         self.bot = Bot()
+        # Stockfish searches on this thread while the window keeps running;
+        # the move found and the FEN it was asked about wait in _bot_search
+        self._bot_pool = ThreadPoolExecutor(max_workers=1)
+        self._bot_search = None
         self.square = 850 // 8
         self.origin_x = 0
         self.origin_y = (height - self.square * 8) // 2
+        # Screen <-> board lookups for the user's side, set on color change
+        self.orient_board()
         self.sidepanel_x = 850
         self.sidepanel_width = width - 850
+        self.sidepanel = SidePanel(self.sidepanel_x, 0, self.sidepanel_width,
+                                   self.window.height)
+
+        # Click areas of the side panel buttons as (left, bottom, right,
+        # top), matching where SidePanel draws them
+        settings_button_size = 35
+        settings_button_x = (self.sidepanel_x + self.sidepanel_width
+                             - settings_button_size - 10)
+        settings_button_y = self.window.height - settings_button_size - 10
+        self._settings_rect = (settings_button_x, settings_button_y,
+                               settings_button_x + settings_button_size,
+                               settings_button_y + settings_button_size)
+        button_width = 100
+        button_height = 40
+        action_button_x = (self.sidepanel_x + self.sidepanel_width // 2
+                           - button_width // 2)
+        action_button_y = 200
+        self._action_rect = (action_button_x, action_button_y,
+                             action_button_x + button_width,
+                             action_button_y + button_height)
 
         cell_pixel_width = 256
 
@@ -259,11 +540,29 @@ class GameView(arcade.View):
             self.board, self.square, self.origin_x, self.origin_y
         )
 
+        # Board tiles in two batches: the plain board as baked tile sprites,
+        # rebuilt only when the orientation changes, and the marked tiles
+        # drawn over it, rebuilt when a highlight, click or check changes
+        self.board_sprites = None
+        self._board_sprites_key = None
+        self.mark_shapes = None
+        self._mark_shapes_key = None
+
+        # Finished frame, redrawn only when something on screen changed.
+        # Input handlers set dirty; idle frames just show the frame again
+        self.dirty = True
+        self.frame_fbo = None
+        self._frame_filter = None
+
         # TRACKERS FOR SPRITE DRAGGING
         self.dragging_sprite = None
         self.drag_start_pos = None
         self.drag_offset_x = 0
         self.drag_offset_y = 0
+        # Latest drag position, applied once per frame in on_update
+        self._pending_drag = None
+        # History steps asked for by arrow keys since the last frame
+        self._history_steps = 0
 
         """
         Added game_started flag to track if first move has been made.
@@ -271,62 +570,14 @@ class GameView(arcade.View):
         """
         self.game_started = False
 
+        # Print the board after each user move
+        self.debug = False
+
         self.manager = UIManager()
         self.manager.enable()
 
         # Difficulty Buttons
-        easy_style = {
-            "normal": UIFlatButton.UIStyle(
-                bg=arcade.color.DARK_GRAY,
-                font_color=(0, 150, 0),  # Darker green
-                border=(60, 60, 60),
-                border_width=2),
-            "hover": UIFlatButton.UIStyle(
-                font_color=(0, 150, 0),  # Darker green
-                bg=arcade.color.GRAY,
-                border=(60, 60, 60),
-                border_width=2),
-            "press": UIFlatButton.UIStyle(
-                font_color=(0, 150, 0),  # Darker green
-                bg=arcade.color.LIGHT_GRAY,
-                border=(60, 60, 60),
-                border_width=2),
-        }
-        medium_style = {
-            "normal": UIFlatButton.UIStyle(
-                bg=arcade.color.DARK_GRAY,
-                font_color=(200, 100, 0),  # Darker orange
-                border=(60, 60, 60),
-                border_width=2),
-            "hover": UIFlatButton.UIStyle(
-                font_color=(200, 100, 0),  # Darker orange
-                bg=arcade.color.GRAY,
-                border=(60, 60, 60),
-                border_width=2),
-            "press": UIFlatButton.UIStyle(
-                font_color=(200, 100, 0),  # Darker orange
-                bg=arcade.color.LIGHT_GRAY,
-                border=(60, 60, 60),
-                border_width=2),
-        }
-        hard_style = {
-            "normal": UIFlatButton.UIStyle(
-                bg=arcade.color.DARK_GRAY,
-                font_color=(180, 0, 0),  # Darker red
-                border=(60, 60, 60),
-                border_width=2),
-            "hover": UIFlatButton.UIStyle(
-                font_color=(180, 0, 0),  # Darker red
-                bg=arcade.color.GRAY,
-                border=(60, 60, 60),
-                border_width=2),
-            "press": UIFlatButton.UIStyle(
-                font_color=(180, 0, 0),  # Darker red
-                bg=arcade.color.LIGHT_GRAY,
-                border=(60, 60, 60),
-                border_width=2),
-        }
-        self.easy = UIFlatButton(text="EASY", width=120, style=easy_style)
+        self.easy = UIFlatButton(text="EASY", width=120, style=EASY_STYLE)
         self.easy.center_x = 980
         self.easy.center_y = 670
         self.manager.add(self.easy)
@@ -334,11 +585,12 @@ class GameView(arcade.View):
         @self.easy.event("on_click")
         def on_click_easy(_event):
             print("EASY")
-            self.bot.set_elo(400)
+            # Queued behind any running search, never in the middle of one
+            self._bot_pool.submit(self.bot.set_elo, 400)
             self.current_difficulty = "EASY"
 
         self.medium = UIFlatButton(text="MEDIUM", width=120,
-                                   style=medium_style)
+                                   style=MEDIUM_STYLE)
         self.medium.center_x = 980
         self.medium.center_y = 610
         self.manager.add(self.medium)
@@ -346,10 +598,11 @@ class GameView(arcade.View):
         @self.medium.event("on_click")
         def on_click_medium(_event):
             print("MEDIUM")
-            self.bot.set_elo(1000)
+            # Queued behind any running search, never in the middle of one
+            self._bot_pool.submit(self.bot.set_elo, 1000)
             self.current_difficulty = "MEDIUM"
 
-        self.hard = UIFlatButton(text="HARD", width=120, style=hard_style)
+        self.hard = UIFlatButton(text="HARD", width=120, style=HARD_STYLE)
         self.hard.center_x = 980
         self.hard.center_y = 550
         self.manager.add(self.hard)
@@ -357,32 +610,16 @@ class GameView(arcade.View):
         @self.hard.event("on_click")
         def on_click_hard(_event):
             print("HARD")
-            self.bot.set_elo(2000)
+            # Queued behind any running search, never in the middle of one
+            self._bot_pool.submit(self.bot.set_elo, 2000)
             self.current_difficulty = "HARD"
 
         # ================ THEME BUTTONS ======================
-        theme_button_style = {
-            "normal": UIFlatButton.UIStyle(
-                bg=arcade.color.DARK_GRAY,
-                font_color=arcade.color.BLACK,
-                border=(60, 60, 60),
-                border_width=2),
-            "hover": UIFlatButton.UIStyle(
-                bg=arcade.color.GRAY,
-                font_color=arcade.color.BLACK,
-                border=(60, 60, 60),
-                border_width=2),
-            "press": UIFlatButton.UIStyle(
-                bg=arcade.color.LIGHT_GRAY,
-                font_color=arcade.color.BLACK,
-                border=(60, 60, 60),
-                border_width=2),
-        }
 
         # White theme button
         self.white_theme_button = UIFlatButton(text="Change WHITE Theme",
                                                width=180,
-                                               style=theme_button_style)
+                                               style=THEME_BUTTON_STYLE)
         self.white_theme_button.center_x = 980
         self.white_theme_button.center_y = 460
         self.manager.add(self.white_theme_button)
@@ -390,15 +627,16 @@ class GameView(arcade.View):
         @self.white_theme_button.event("on_click")
         def _white_theme(_event):
             print("Changing WHITE Theme")
+            self.dirty = True
             self.sheet.next_white_theme()
-            self.sprites.build_from_board(self.board, self.square,
-                                         self.origin_x, self.origin_y,
-                                         self.game.user_color)
+            self.sprites.reload_theme(self.board, self.square,
+                                      self.origin_x, self.origin_y,
+                                      self.game.user_color)
 
         # Black theme button
         self.black_theme_button = UIFlatButton(text="Change BLACK Theme",
                                                width=180,
-                                               style=theme_button_style)
+                                               style=THEME_BUTTON_STYLE)
         self.black_theme_button.center_x = 980
         self.black_theme_button.center_y = 400
         self.manager.add(self.black_theme_button)
@@ -406,71 +644,49 @@ class GameView(arcade.View):
         @self.black_theme_button.event("on_click")
         def _black_theme(_event):
             print("Changing BLACK Theme")
+            self.dirty = True
             self.sheet.next_black_theme()
-            self.sprites.build_from_board(self.board, self.square,
-                                         self.origin_x, self.origin_y,
-                                         self.game.user_color)
+            self.sprites.reload_theme(self.board, self.square,
+                                      self.origin_x, self.origin_y,
+                                      self.game.user_color)
 
         # ================ COLOR SELECTION BUTTON ======================
-        self.color_button_style_white = {
-            "normal": UIFlatButton.UIStyle(
-                bg=arcade.color.WHITE,
-                font_color=arcade.color.BLACK,
-                border=(128, 128, 128),
-                border_width=2),
-            "hover": UIFlatButton.UIStyle(
-                bg=arcade.color.LIGHT_GRAY,
-                font_color=arcade.color.BLACK,
-                border=(128, 128, 128),
-                border_width=2),
-            "press": UIFlatButton.UIStyle(
-                bg=arcade.color.GRAY,
-                font_color=arcade.color.BLACK,
-                border=(128, 128, 128),
-                border_width=2),
-        }
-
-        self.color_button_style_black = {
-            "normal": UIFlatButton.UIStyle(
-                bg=arcade.color.BLACK,
-                font_color=arcade.color.WHITE,
-                border=(128, 128, 128),
-                border_width=2),
-            "hover": UIFlatButton.UIStyle(
-                bg=arcade.color.LIGHT_GRAY,
-                font_color=arcade.color.WHITE,
-                border=(128, 128, 128),
-                border_width=2),
-            "press": UIFlatButton.UIStyle(
-                bg=arcade.color.GRAY,
-                font_color=arcade.color.WHITE,
-                border=(128, 128, 128),
-                border_width=2),
-        }
-
-        # Color selection button
-        self.color_button = UIFlatButton(text="WHITE", width=80,
-                                        style=self.color_button_style_white)
+
+
+        # Color selection button. It owns copies of its state styles, so a
+        # toggle can recolor them in place instead of swapping style dicts
+        self.color_button = UIFlatButton(
+            text="WHITE", width=80,
+            style={state: replace(state_style) for state, state_style
+                   in COLOR_BUTTON_STYLE_WHITE.items()})
         self.color_button.center_x = 980
         self.color_button.center_y = 50
         self.manager.add(self.color_button)
 
         @self.color_button.event("on_click")
         def _toggle_color(_event):
+            self.dirty = True
             # Toggle user color
             self.game.user_color = (Color.BLACK
                                    if self.game.user_color == Color.WHITE
                                    else Color.WHITE)
+            self.orient_board()
 
             # Update button text and style
             if self.game.user_color == Color.WHITE:
                 self.color_button.text = "WHITE"
-                self.color_button.style = self.color_button_style_white
+                palette = COLOR_BUTTON_STYLE_WHITE
             else:
                 self.color_button.text = "BLACK"
-                self.color_button.style = self.color_button_style_black
-
-            # Reset the game
+                palette = COLOR_BUTTON_STYLE_BLACK
+            for state, state_style in self.color_button.style.items():
+                state_style.bg = palette[state].bg
+                state_style.font_color = palette[state].font_color
+            # Style fields are not observed, so ask for the redraw
+            self.color_button.trigger_render()
+
+            # Reset the game, dropping any search for the old one
+            self._bot_search = None
             self.board.reset_board()
             self.game.turn = Color.WHITE
             self.game_started = False
@@ -481,8 +697,7 @@ class GameView(arcade.View):
 
             # If user chose black, bot makes first move
             if self.game.user_color == Color.BLACK:
-                self.make_bot_move()
-                self.game.turn = self.game.user_color
+                self.queue_bot_move()
                 self.game_started = True
 
         # Hide all settings buttons initially
@@ -492,6 +707,20 @@ class GameView(arcade.View):
         self.white_theme_button.visible = False
         self.black_theme_button.visible = False
 
+    def orient_board(self):
+        """
+        Rebuild the lookups that depend on the user's side: screen order of
+        files and ranks, and where a piece sprite sits on each file and rank
+        """
+        self._vfile = self._vrank = view_table(self.game.user_color)
+        square = self.square
+        # The same centers ChessSprites places its sprites at, a little
+        # above the middle of the square
+        self._cx = [self.origin_x + visual * square + square / 2
+                    for visual in self._vfile]
+        self._cy = [self.origin_y + visual * square + square / 1.5
+                    for visual in self._vrank]
+
     def screen_to_board_coords(self, visual_file: int,
                                visual_rank: int) -> tuple[int, int]:
         """
@@ -503,9 +732,10 @@ class GameView(arcade.View):
         Returns:
             Tuple of (actual_file, actual_rank) on the board
         """
-        if self.game.user_color == Color.BLACK:
-            return (7 - visual_file, 7 - visual_rank)
-        return (visual_file, visual_rank)
+        # Clicks off the board stay off it; callers bounds-check the result
+        if not (0 <= visual_file <= 7 and 0 <= visual_rank <= 7):
+            return (visual_file, visual_rank)
+        return (self._vfile[visual_file], self._vrank[visual_rank])
 
     def board_to_screen_coords(self, board_file: int,
                                board_rank: int) -> tuple[int, int]:
@@ -518,9 +748,33 @@ class GameView(arcade.View):
         Returns:
             Tuple of (visual_file, visual_rank) for screen display
         """
-        if self.game.user_color == Color.BLACK:
-            return (7 - board_file, 7 - board_rank)
-        return (board_file, board_rank)
+        return (self._vfile[board_file], self._vrank[board_rank])
+
+    def draw_board(self):
+        """Draw the board tiles, rebuilding their batches if any changed"""
+        user_color = self.game.user_color
+        if user_color != self._board_sprites_key:
+            self.board_sprites = build_board_sprites(
+                self.board, self.origin_x, self.origin_y, self.square,
+                user_color)
+            self._board_sprites_key = user_color
+
+        # Square colors never change, so the marked tile sets alone tell
+        # whether any tile's colors did
+        board = self.board
+        mark_key = (user_color, frozenset(board.highlighted_tiles),
+                    frozenset(board.prev_tiles),
+                    frozenset(board.clicked_tiles),
+                    frozenset(board.check_tiles))
+        if mark_key != self._mark_shapes_key:
+            self.mark_shapes = build_mark_shapes(
+                self.board, self.origin_x, self.origin_y, self.square,
+                user_color)
+            self._mark_shapes_key = mark_key
+
+        # One texel per pixel, so sample without filtering
+        self.board_sprites.draw(pixelated=True)
+        self.mark_shapes.draw()
 
     def on_show_view(self):
         """Called when this view is shown - ensures buttons are hidden"""
@@ -529,41 +783,96 @@ class GameView(arcade.View):
         self.hard.visible = False
         self.white_theme_button.visible = False
         self.black_theme_button.visible = False
+        self.dirty = True
+        # Closing the window does not hide the view, so listen for it too
+        self.window.push_handlers(on_close=self.stop_bot)
 
-    def on_draw(self):
-        if self.filter_on:
-            # Draw our stuff into the CRT filter
-            self.crt_filter.use()
-            self.crt_filter.clear()
-            # Switch back to our window and draw the CRT filter do
-            # draw its stuff to the screen
-            draw_board(self.board, self.origin_x, self.origin_y,
-                      self.square, self.game.user_color)
-            self.sprites.draw()
-            draw_sidepanel(self.sidepanel_x, 0, self.sidepanel_width,
-                          self.window.height, self.game, self.board,
-                          self.settings_mode)
-            self.manager.draw()
-
-            self.window.use()
-            self.clear()
-
-            # draw stretched
-            self.crt_filter.draw()
+    def on_hide_view(self):
+        """Called when this view is replaced; stops listening for close"""
+        self.window.remove_handlers(on_close=self.stop_bot)
 
-        else:
-            self.clear()
-            draw_board(self.board, self.origin_x, self.origin_y,
-                      self.square, self.game.user_color)
-            self.sprites.draw()
-            draw_sidepanel(self.sidepanel_x, 0, self.sidepanel_width,
-                          self.window.height, self.game, self.board,
-                          self.settings_mode)
-            self.manager.draw()
+    def stop_bot(self):
+        """Drop queued bot work and let the search thread finish alone"""
+        self._bot_pool.shutdown(wait=False, cancel_futures=True)
+        self._bot_search = None
+
+    def frame_buffer(self):
+        """
+        Offscreen framebuffer holding the last finished frame, recreated
+        (and marked dirty) when the window's framebuffer size changes
+
+        Returns:
+            Framebuffer matching the window's size and multisampling
+        """
+        size = self.window.get_framebuffer_size()
+        if self.frame_fbo is None or self.frame_fbo.size != size:
+            ctx = self.window.ctx
+            self.frame_fbo = ctx.framebuffer(color_attachments=[
+                ctx.texture(size, components=4,
+                            samples=self.window.config.samples or 0)])
+            self.dirty = True
+        return self.frame_fbo
+
+    def crt(self):
+        """
+        CRT filter, created the first time the filter is turned on
+
+        Returns:
+            CRTFilter sized to the window
+        """
+        if self.crt_filter is None:
+            self.crt_filter = CRTFilter(self.window.width, self.window.height,
+                                        resolution_down_scale=1.0,
+                                        hard_scan=-2.0,
+                                        hard_pix=-2.0,
+                                        display_warp=Vec2(0.0, 0.0),
+                                        mask_dark=0.5,
+                                        mask_light=1.2)
+        return self.crt_filter
+
+    def draw_panel(self):
+        """Draw the side panel and buttons, which stay out of the CRT pass"""
+        self.sidepanel.draw(self.game, self.board, self.settings_mode)
+        self.manager.draw()
+
+    def on_draw(self):
+        frame_fbo = self.frame_buffer()
+        if self.dirty or self._frame_filter != self.filter_on:
+            if self.filter_on:
+                # Only the board and pieces go through the CRT filter
+                crt_filter = self.crt()
+                crt_filter.use()
+                crt_filter.clear()
+                self.draw_board()
+                self.sprites.draw()
+
+                frame_fbo.use()
+                frame_fbo.clear(color=self.window.background_color)
+                # draw stretched
+                crt_filter.draw()
+            else:
+                frame_fbo.use()
+                frame_fbo.clear(color=self.window.background_color)
+                self.draw_board()
+                self.sprites.draw()
+
+            # Text and buttons are drawn crisp on top of either
+            self.draw_panel()
+            self.dirty = False
+            self._frame_filter = self.filter_on
+
+        # Switch back to our window and show the finished frame
+        self.window.use()
+        screen = self.window.ctx.screen
+        self.window.ctx.copy_framebuffer(frame_fbo, screen)
+        # The copy binds the frame for reading behind arcade's back,
+        # so rebind the screen for anything that reads it afterwards
+        screen.use(force=True)
 
     def on_mouse_press(self, x, y, button, modifiers):
         """
-        Handle mouse button press events
+        Handle mouse button press events. Each region's handler returns
+        True when it took the click, cheapest hit tests first.
 
         Args:
             x: Mouse x coordinate
@@ -571,225 +880,309 @@ class GameView(arcade.View):
             button: Which mouse button was pressed
             key_modifiers: Active keyboard modifiers
         """
+        self.dirty = True
 
-        # Settings button
-        settings_button_size = 35
-        settings_button_x = (self.sidepanel_x + self.sidepanel_width
-                            - settings_button_size - 10)
-        settings_button_y = self.window.height - settings_button_size - 10
-
-        if (settings_button_x <= x <= settings_button_x + settings_button_size
-                and settings_button_y <= y
-                <= settings_button_y + settings_button_size):
-            # Toggle settings mode
-            self.settings_mode = not self.settings_mode
-
-            # Show/hide settings buttons
-            self.easy.visible = self.settings_mode
-            self.medium.visible = self.settings_mode
-            self.hard.visible = self.settings_mode
-            self.white_theme_button.visible = self.settings_mode
-            self.black_theme_button.visible = self.settings_mode
-
+        if self._hit_settings(x, y):
             return
 
         # Don't process game clicks if in settings mode
         if self.settings_mode:
             return
 
-        # Resign button
-        button_width = 100
-        button_height = 40
-        action_button_x = (self.sidepanel_x + self.sidepanel_width // 2
-                          - button_width // 2)
-        action_button_y = 200
-
-        if (action_button_x <= x <= action_button_x + button_width
-                and action_button_y <= y
-                <= action_button_y + button_height):
+        if self._hit_action_button(x, y):
+            return
 
-            if (self.board.checkmate or self.board.stalemate
-                    or self.board.resigned):
-                # NEW GAME clicked
-                self.board.reset_board()
-                self.game.turn = Color.WHITE
-                self.game_started = False
+        if (self.board.checkmate or self.board.stalemate
+                or self.board.resigned):
+            return
 
-                self.sprites.build_from_board(
-                    self.board, self.square, self.origin_x, self.origin_y,
-                    self.game.user_color
-                )
+        # Required by python arcade, needed to pass pylint
+        # no functionality currently
+        if modifiers & arcade.key.MOD_SHIFT:
+            pass
 
-                if self.game.user_color == Color.BLACK:
-                    self.make_bot_move()
-                    self.game.turn = self.game.user_color
-                    self.game_started = True
+        # Same flip-once table lookup the drop uses
+        file, rank = self.get_tile_from_mouse(x, y)
+        if file is not None:
+            self._hit_board_tile(button, file, rank, x, y)
 
-                print("New game started!")
-            else:
-                # RESIGN clicked
-                self.board.resign(self.game.user_color)
-                winner = self.board.mate_color.name
-                loser = self.game.user_color.name
-                print(f"{loser} resigned. {winner} wins!")
+    def _hit_settings(self, x, y) -> bool:
+        """
+        Toggle the settings panel if the settings button was clicked
 
-            return
+        Args:
+            x: Mouse x coordinate
+            y: Mouse y coordinate
+        Returns:
+            True if the click hit the settings button
+        """
+        left, bottom, right, top = self._settings_rect
+        if not (left <= x <= right and bottom <= y <= top):
+            return False
 
-        if (self.board.checkmate or self.board.stalemate
-                or self.board.resigned):
-            return
+        # Toggle settings mode
+        self.settings_mode = not self.settings_mode
 
-        if button == arcade.MOUSE_BUTTON_LEFT:
-            # Required by python arcade, needed to pass pylint
-            # no functionality currently
-            if modifiers & arcade.key.MOD_SHIFT:
-                pass
+        # Show/hide settings buttons
+        self.easy.visible = self.settings_mode
+        self.medium.visible = self.settings_mode
+        self.hard.visible = self.settings_mode
+        self.white_theme_button.visible = self.settings_mode
+        self.black_theme_button.visible = self.settings_mode
 
-            visual_file = int((x - self.origin_x) // self.square)
-            visual_rank = int((y - self.origin_y) // self.square)
+        return True
 
-            # Convert visual coordinates to actual board coordinates
-            file, rank = self.screen_to_board_coords(visual_file, visual_rank)
+    def _hit_action_button(self, x, y) -> bool:
+        """
+        Resign, or start a new game once the game is over, if the side
+        panel's action button was clicked
 
-            if 0 <= file <= 7 and 0 <= rank <= 7:
-                tile = self.board.grid[rank][file]
+        Args:
+            x: Mouse x coordinate
+            y: Mouse y coordinate
+        Returns:
+            True if the click hit the action button
+        """
+        left, bottom, right, top = self._action_rect
+        if not (left <= x <= right and bottom <= y <= top):
+            return False
 
-                if (tile.has_piece()
-                        and tile.piece_here.color == self.game.user_color):
-                    self.board.remove_highlights()
-                    self.board.get_piece(tile.piece_here)
-                    self.board.highlight_moves()
+        if (self.board.checkmate or self.board.stalemate
+                or self.board.resigned):
+            # NEW GAME clicked; a search still running has nothing to say
+            self._bot_search = None
+            self.board.reset_board()
+            self.game.turn = Color.WHITE
+            self.game_started = False
 
-                    #Check if checkmate or stalemate
-                    piece = tile.get_piece_here()
-                    if piece.piece_type == PieceType.KING:
-                        king_moves = self.board.get_all_legal(piece)
-                        if len(king_moves) == 0:
+            self.sprites.build_from_board(
+                self.board, self.square, self.origin_x, self.origin_y,
+                self.game.user_color
+            )
 
-                            #Check if anyone has moves
-                            all_moves = self.board.get_all_moves(
-                                self.game.user_color)
-                            if len(all_moves) == 0:
+            if self.game.user_color == Color.BLACK:
+                self.queue_bot_move()
+                self.game_started = True
 
-                                #Checkmate or stalemate
-                                enemy_moves = self.board.get_all_enemy_moves(
-                                    self.game.user_color)
+            print("New game started!")
+        else:
+            # RESIGN clicked; drop the bot's answer if it is still searching
+            self._bot_search = None
+            self.board.resign(self.game.user_color)
+            winner = self.board.mate_color.name
+            loser = self.game.user_color.name
+            print(f"{loser} resigned. {winner} wins!")
 
-                                if piece.current_pos in enemy_moves:
-                                    #Checkmate
-                                    print(f"{self.game.user_color.name} is "
-                                          "in CHECKMATE")
-                                    self.board.set_checkmate()
-                                    self.board.set_mate_color(
-                                        self.game.user_color.opposite())
-                                    return
-
-                                #Stalemate
-                                print(f"{self.game.user_color.name} is "
-                                      "in STALEMATE")
-                                self.board.set_stalemate()
-                                return
-
-                    #Check for draws
-                    if self.board.check_draw():
-                        print("Stalemate")
-                        self.board.set_stalemate()
-                        return
-
-                    # Start dragging the sprite
-                    sprite = self.get_sprite_at_position(file, rank)
-                    if sprite:
-                        self.dragging_sprite = sprite
-                        self.drag_start_pos = (file, rank)
-
-                        # Calculate offset
-                        self.drag_offset_x = x - sprite.center_x
-                        self.drag_offset_y = y - sprite.center_y
-
-                elif self.game.turn != self.game.user_color:
-                    print("Not your turn")
-
-                elif tile.highlighted:
-                    self.board.remove_highlights()
-                    self.board.remove_prev()
-                    self.move_piece_and_update_sprites(file, rank)
-                    self.board.print_board()
-
-                    self.game.turn = self.game.user_color.opposite()
-                    self.make_bot_move()
-                    self.game.turn = self.game.user_color
+        return True
 
-                else:
-                    self.board.selected_piece = None
-                    self.board.remove_highlights()
+    def _hit_board_tile(self, button, file, rank, x, y):
+        """
+        Handle a click on a board tile: select, drag or move with the left
+        button, toggle the tile's mark with the right
 
-        elif button == arcade.MOUSE_BUTTON_RIGHT:
+        Args:
+            button: Which mouse button was pressed
+            file: Board file clicked (0-7)
+            rank: Board rank clicked (0-7)
+            x: Mouse x coordinate
+            y: Mouse y coordinate
+        """
+        if button == arcade.MOUSE_BUTTON_RIGHT:
+            self.board.toggle_click(file, rank)
+            return
 
-            if modifiers & arcade.key.MOD_SHIFT:
-                pass
+        if button != arcade.MOUSE_BUTTON_LEFT:
+            return
 
-            visual_file = int((x - self.origin_x) // self.square)
-            visual_rank = int((y - self.origin_y) // self.square)
-            file, rank = self.screen_to_board_coords(visual_file, visual_rank)
+        tile = self.board.grid[rank][file]
+
+        # The bot's reply is pending, so nothing may be picked up or moved
+        if not self.user_to_move():
+            print("Not your turn")
+
+        elif (tile.has_piece()
+                and tile.piece_here.color == self.game.user_color):
+            self.board.remove_highlights()
+            self.board.get_piece(tile.piece_here)
+            self.board.highlight_moves()
+
+            #Check if checkmate or stalemate
+            if self._user_game_over(tile.get_piece_here()):
+                return
+
+            #Check for draws
+            if self.board.check_draw():
+                print("Stalemate")
+                self.board.set_stalemate()
+                return
+
+            # Start dragging the sprite
+            sprite = self.get_sprite_at_position(file, rank)
+            if sprite:
+                self.dragging_sprite = sprite
+                self.drag_start_pos = (file, rank)
+                self.sprites.lift(sprite)
+
+                # Calculate offset
+                self.drag_offset_x = x - sprite.center_x
+                self.drag_offset_y = y - sprite.center_y
+                self._pending_drag = None
+
+        # Moves are only played from the latest position, not from history
+        elif tile.highlighted and self.board.is_curr_pos():
+            self.board.remove_highlights()
+            self.board.remove_prev()
+            self.move_piece_and_update_sprites(file, rank)
+            self.queue_bot_move()
 
-            if 0 <= file <= 7 and 0 <= rank <= 7:
-                tile = self.board.grid[rank][file]
+        else:
+            self.board.selected_piece = None
+            self.board.remove_highlights()
 
-                if tile.clicked:
-                    tile.clear_click()
-                else:
-                    tile.click()
+    def _user_game_over(self, piece) -> bool:
+        """
+        Settle checkmate or stalemate for the user when their king is
+        selected. The tests run cheapest first: the king's own moves, then
+        whether any piece can move, then whether the king is attacked.
 
-    def make_bot_move(self):
-        """Make the bot's move and update the display"""
-        bot_color = self.game.user_color.opposite()
-        # Check if we can make a move
-        if (not self.board.is_curr_pos() or self.board.checkmate
-                or self.board.stalemate):
-            return None
+        Args:
+            piece: The user's piece just selected
+        Returns:
+            True if the game just ended in checkmate or stalemate
+        """
+        if piece.piece_type is not PieceType.KING:
+            return False
+        if self.board.get_all_legal(piece):
+            return False
+
+        #Check if anyone has moves
+        color = self.game.user_color
+        if self.board.has_any_legal_move(color):
+            return False
+
+        #Checkmate or stalemate
+        if self.board.check_for_checks(color):
+            #Checkmate
+            print(f"{color.name} is in CHECKMATE")
+            self.board.set_checkmate()
+            self.board.set_mate_color(color.opposite())
+            return True
+
+        #Stalemate
+        print(f"{color.name} is in STALEMATE")
+        self.board.set_stalemate()
+        return True
+
+    def user_to_move(self) -> bool:
+        """
+        Whether the user may pick up or move a piece
 
-        # Get all legal moves
-        move_list = self.board.get_all_moves(color=bot_color)
+        Returns:
+            True unless the bot's reply is still pending or being searched
+        """
+        return (self.game.turn == self.game.user_color
+                and self._bot_search is None)
 
-        # Check for checkmate or stalemate
-        if len(move_list) == 0:
-            all_moves = self.board.get_all_enemy_moves(color=bot_color)
+    def queue_bot_move(self):
+        """
+        Hand the turn to the bot and let it move after BOT_MOVE_DELAY
+        without blocking the window meanwhile
+        """
+        self.game.turn = self.game.user_color.opposite()
+        arcade.unschedule(self._deferred_bot_move)
+        arcade.schedule_once(self._deferred_bot_move, BOT_MOVE_DELAY)
 
-            for rank in range(8):
-                for file in range(8):
-                    piece = self.board.grid[rank][file].piece_here
+    def _deferred_bot_move(self, delta_time):
+        """
+        Start the queued bot move, or give the turn back to the user if the
+        game is over
 
-                    if (piece and piece.color == bot_color
-                            and piece.piece_type == PieceType.KING):
+        Args:
+            delta_time: Seconds since the move was queued
+        """
+        # A new game may have started since the move was queued
+        if self.game.turn == self.game.user_color:
+            return
+        # Wait for the user to come back from browsing the history
+        if not self.board.is_curr_pos():
+            arcade.schedule_once(self._deferred_bot_move, BOT_MOVE_DELAY)
+            return
+        if not self.make_bot_move():
+            self.game.turn = self.game.user_color
+        self.dirty = True
 
-                        if piece.current_pos in all_moves:
-                            print(f"{bot_color.name} is in CHECKMATE")
-                            self.board.set_checkmate()
-                            self.board.set_mate_color(bot_color.opposite())
-                            return None
+    def make_bot_move(self) -> bool:
+        """
+        Settle the game if the bot cannot move, otherwise start its search
 
-                        print(f"{bot_color.name} is in STALEMATE")
-                        self.board.set_stalemate()
-                        return None
+        Returns:
+            True if a search was started; finish_bot_move plays the result
+        """
+        bot_color = self.game.user_color.opposite()
+        # Check if we can make a move
+        if (not self.board.is_curr_pos() or self.board.checkmate
+                or self.board.stalemate or self.board.resigned):
+            return False
+
+        # Check for checkmate or stalemate: the search for a legal move
+        # stops at the first one, and the king is tested for attack on the
+        # bitboards without generating every enemy move
+        if (not self.board.has_any_legal_move(bot_color)
+                and self.board.find_king(bot_color)):
+
+            if self.board.check_for_checks(bot_color):
+                print(f"{bot_color.name} is in CHECKMATE")
+                self.board.set_checkmate()
+                self.board.set_mate_color(bot_color.opposite())
+                return False
+
+            print(f"{bot_color.name} is in STALEMATE")
+            self.board.set_stalemate()
+            return False
 
         if self.board.check_draw():
             print("stalemate from not enough pieces!")
             self.board.set_stalemate()
-            return None
-        move = self.bot.make_move(self.board, bot_color)
+            return False
+
+        fen = self.board.board_state(active_color=bot_color)
+        self._bot_search = (self._bot_pool.submit(self.bot.next_move, fen),
+                            fen)
+        return True
+
+    def finish_bot_move(self):
+        """Play the move the bot's search found and update the display"""
+        future, fen = self._bot_search
+        bot_color = self.game.user_color.opposite()
+        # Leave it while the user browses the history
+        if not self.board.is_curr_pos():
+            return
+        self._bot_search = None
+        # The game ended, or a new game or side started, while the bot
+        # was thinking
+        if (self.board.resigned or self.board.checkmate
+                or self.board.stalemate
+                or self.game.turn == self.game.user_color
+                or self.board.board_state(active_color=bot_color) != fen):
+            return
+
+        move = self.bot.apply_move(self.board, bot_color, future.result())
+        self.game.turn = self.game.user_color
+        self.dirty = True
 
         if move:
-            from_pos, to_pos = move
+            # The bot speaks (rank, file); everything here is (file, rank)
+            from_pos, to_pos = move[0][::-1], move[1][::-1]
 
-            # Rebuild sprites to show new board state
-            self.sprites.build_from_board(
-                self.board, self.square, self.origin_x, self.origin_y,
-                self.game.user_color
+            # Move just the bot's piece (and its capture) on screen
+            self.sprites.move_piece(
+                self.board, from_pos, to_pos, self.square, self.origin_x,
+                self.origin_y, self.game.user_color
             )
 
             # Highlight the bot's move (from and to squares)
-            self.board.grid[from_pos[0]][from_pos[1]].prev_move()
-            self.board.grid[to_pos[0]][to_pos[1]].prev_move()
+            self.board.mark_prev(*from_pos)
+            self.board.mark_prev(*to_pos)
 
             # Clear and update check indicators
             self.board.remove_check_indicators()
@@ -797,7 +1190,6 @@ class GameView(arcade.View):
             self.board.highlight_king_in_check(self.game.user_color)
             # Check if bot's king is somehow in check
             self.board.highlight_king_in_check(bot_color)
-        return None
 
     def get_tile_from_mouse(self, x, y):
         """
@@ -812,10 +1204,9 @@ class GameView(arcade.View):
         visual_file = int((x - self.origin_x) // self.square)
         visual_rank = int((y - self.origin_y) // self.square)
 
-        file, rank = self.screen_to_board_coords(visual_file, visual_rank)
-
-        if 0 <= file <= 7 and 0 <= rank <= 7:
-            return file, rank
+        # Bounds-check on screen, then flip through the view tables
+        if 0 <= visual_file <= 7 and 0 <= visual_rank <= 7:
+            return self._vfile[visual_file], self._vrank[visual_rank]
         return None, None
 
     def get_sprite_at_position(self, file, rank):
@@ -828,22 +1219,8 @@ class GameView(arcade.View):
         Returns:
             The sprite at that position, or None if not found
         """
-        # Convert board coordinates to visual coordinates for sprite
-        # positioning
-        visual_file, visual_rank = self.board_to_screen_coords(file, rank)
-
-        # Calculate the center of the square
-        center_x = (self.origin_x + visual_file * self.square
-                   + self.square // 2)
-        center_y = (self.origin_y + visual_rank * self.square
-                   + self.square // 2)
-
-        # Find sprite near this position (within half a square)
-        for sprite in self.sprites.sprite_list:
-            if (abs(sprite.center_x - center_x) < self.square // 2
-                    and abs(sprite.center_y - center_y) < self.square // 2):
-                return sprite
-        return None
+        # The sprites are kept one slot per square, so no position search
+        return self.sprites.sprite_at(file, rank)
 
     def move_piece_and_update_sprites(self, file, rank):
         """
@@ -857,33 +1234,32 @@ class GameView(arcade.View):
         if self.board.checkmate or self.board.stalemate:
             return
 
-        #Handle captures
+        #Handle captures; the board itself clears the captured tile
         piece = self.board.grid[rank][file].piece_here
         if piece:
-            captured_piece = piece
-            self.sprites.remove_sprite_by_piece(captured_piece)
-            self.board.grid[rank][file].piece_here = None
+            self.sprites.remove_sprite_by_piece(piece)
 
         # Move piece on board and update sprite positions
+        from_pos = self.board.selected_piece.current_pos
         self.board.move_piece(file, rank)
 
         # Pawn at end of board (promotion)
         piece = self.board.grid[rank][file].get_piece_here()
-        if piece and piece.piece_type == PieceType.PAWN:
-            if ((rank == 7 and piece.color == Color.WHITE)
-                    or (rank == 0 and piece.color == Color.BLACK)):
-                print(f"{piece.color.name} PAWN PROMOTED!")
-                piece.promote()
-                self.board.promote(piece.color, file, rank)
-
-        # Rebuild sprites to show new board state
-        self.sprites.build_from_board(
-            self.board, self.square, self.origin_x, self.origin_y,
-            self.game.user_color
+        if (piece and piece.piece_type is PieceType.PAWN
+                and rank == PROMOTION_RANK[piece.color]):
+            print(f"{piece.color.name} PAWN PROMOTED!")
+            piece.promote()
+            self.board.promote(piece.color, file, rank)
+
+        # Move just the user's piece on screen
+        self.sprites.move_piece(
+            self.board, from_pos, (file, rank), self.square,
+            self.origin_x, self.origin_y, self.game.user_color
         )
 
-        # Reset game state
-        self.board.print_board()
+        # Dump the board to the console when debugging
+        if self.debug:
+            self.board.print_board()
 
     def on_mouse_motion(self, x, y, dx, dy):
         """
@@ -895,11 +1271,35 @@ class GameView(arcade.View):
             dx: Change in x position
             dy: Change in y position
         """
-        # Handle dragging of pieces
+        # Drags move a sprite, and the UI buttons react to hovering
+        self.dirty = True
+
+        # Handle dragging of pieces; only the latest position is kept, so
+        # a fast mouse moves the sprite once per frame
         if self.dragging_sprite:
-            # Update sprite position to follow mouse
-            self.dragging_sprite.center_x = x - self.drag_offset_x
-            self.dragging_sprite.center_y = y - self.drag_offset_y
+            self._pending_drag = (x - self.drag_offset_x,
+                                  y - self.drag_offset_y)
+
+    def on_update(self, delta_time):
+        """
+        Move the dragged sprite to where the mouse last was, catch up
+        with arrow key presses and play the bot's move once it is found
+
+        Args:
+            delta_time: Seconds since the last update
+        """
+        sprite, pending = self.dragging_sprite, self._pending_drag
+        if sprite and pending:
+            # One position write updates the sprite buffer once, where
+            # center_x then center_y would update it twice
+            sprite.position = pending
+        self._pending_drag = None
+
+        if self._history_steps:
+            self.scrub_history()
+
+        if self._bot_search and self._bot_search[0].done():
+            self.finish_bot_move()
 
     def on_mouse_release(self, x, y, button, modifiers):
         """
@@ -911,70 +1311,42 @@ class GameView(arcade.View):
             button: Which mouse button was released
             modifiers: Active keyboard modifiers
         """
+        self.dirty = True
+
         # Required by python arcade, needed to pass pylint
         # no functionality currently
         if modifiers & arcade.key.MOD_SHIFT:
             pass
 
         # Handle dropping of pieces
-        if button == arcade.MOUSE_BUTTON_LEFT and self.dragging_sprite:
+        if (button == arcade.MOUSE_BUTTON_LEFT and self.dragging_sprite
+                and self.user_to_move()):
             file, rank = self.get_tile_from_mouse(x, y)
 
             # Check if dropped on valid highlighted square
-            if file is not None and rank is not None:
-                tile = self.board.grid[rank][file]
-
-                if tile.highlighted:
-                    # Valid move
-                    self.board.remove_highlights()
-                    self.move_piece_and_update_sprites(file, rank)
-                    self.game.turn = self.game.user_color.opposite()
-                    self.make_bot_move()
-                    self.game.turn = self.game.user_color
-                else:
-                    # Invalid move - snap back to original position
-                    orig_file, orig_rank = self.drag_start_pos
-                    visual_file, visual_rank = self.board_to_screen_coords(
-                        orig_file, orig_rank)
-                    center_x = (self.origin_x + visual_file * self.square
-                               + self.square // 2)
-                    center_y = (self.origin_y + visual_rank * self.square
-                               + self.square // 1.5)
-                    self.dragging_sprite.center_x = center_x
-                    self.dragging_sprite.center_y = center_y
-                    self.dragging_sprite = None
-                    self.drag_start_pos = None
-                    self.drag_offset_x = 0
-                    self.drag_offset_y = 0
-                    return
-
-            # Dropped outside board - snap back
+            if (file is not None and self.board.grid[rank][file].highlighted
+                    and self.board.is_curr_pos()):
+                # Valid move; the sprite stays where the move puts it
+                self.dragging_sprite = None
+                self.board.remove_highlights()
+                self.move_piece_and_update_sprites(file, rank)
+                self.queue_bot_move()
+
+        # Invalid move or dropped outside board - snap back
+        self._cancel_drag()
+
+    def _cancel_drag(self):
+        """ Return a dragged sprite to its square and clear the drag state """
+        if self.dragging_sprite:
             orig_file, orig_rank = self.drag_start_pos
-            visual_file, visual_rank = self.board_to_screen_coords(
-                orig_file, orig_rank)
-            center_x = (self.origin_x + visual_file * self.square
-                       + self.square // 2)
-            center_y = (self.origin_y + visual_rank * self.square
-                       + self.square // 2)
-            self.dragging_sprite.center_x = center_x
-            self.dragging_sprite.center_y = center_y
-            self.dragging_sprite = None
-            self.drag_start_pos = None
-            self.drag_offset_x = 0
-            self.drag_offset_y = 0
-            return
-
+            self.dragging_sprite.center_x = self._cx[orig_file]
+            self.dragging_sprite.center_y = self._cy[orig_rank]
+            self.sprites.drop()
         self.dragging_sprite = None
         self.drag_start_pos = None
         self.drag_offset_x = 0
         self.drag_offset_y = 0
 
-    def wait(self):
-        """ Function waits a second prior to making bot move """
-        start = time.time()
-        while time.time() < start + 2:
-            pass
-
     def on_key_press(self, symbol, modifiers):
         '''
         Handles reactions to key press events
@@ -983,37 +1355,60 @@ class GameView(arcade.View):
             symbol: which key was pressed
             modifiers: active keyboard modifiers
         '''
+        self.dirty = True
+        # Only counted here; on_update makes all of a frame's steps at once
         if symbol == arcade.key.DOWN:
-            self.show_prev_move()
+            self._history_steps -= 1
         if symbol == arcade.key.UP:
+            self._history_steps += 1
+
+    def scrub_history(self):
+        ''' Makes the history steps queued by key presses this frame '''
+        steps, self._history_steps = self._history_steps, 0
+        if steps == -1:
+            self.show_prev_move()
+        elif steps == 1:
             self.show_next_move()
+        else:
+            # Walk the board through every step, then sync sprites once
+            step = (self.board.step_back if steps < 0
+                    else self.board.step_forward)
+            moved = False
+            for _ in range(abs(steps)):
+                if not step():
+                    break
+                moved = True
+            if moved:
+                self.sprites.build_from_board(self.board, self.square,
+                                             self.origin_x, self.origin_y,
+                                             self.game.user_color)
+                self.refresh_check_indicators()
+
+    def refresh_check_indicators(self):
+        ''' Marks whichever king is in check in the shown position '''
+        self.board.remove_check_indicators()
+        self.board.highlight_king_in_check(Color.WHITE)
+        self.board.highlight_king_in_check(Color.BLACK)
 
     def show_prev_move(self):
         ''' Goes backwards one move in history'''
-        if self.board.current_index > 0:
-            self.board.current_index -= 1
-            move = self.board.move_history[self.board.current_index]
-            self.board.load_fen(move["FEN"])
-            self.sprites.build_from_board(self.board, self.square,
-                                         self.origin_x, self.origin_y,
-                                         self.game.user_color)
+        if self.board.step_back():
+            # Walk the mover's sprite back along the move just taken back
+            move = self.board.move_history[self.board.current_index + 1]
+            self.sprites.move_piece(self.board, move.to, move.frm, self.square,
+                                    self.origin_x, self.origin_y,
+                                    self.game.user_color)
 
             # Update check indicators for both colors
-            self.board.remove_check_indicators()
-            self.board.highlight_king_in_check(Color.WHITE)
-            self.board.highlight_king_in_check(Color.BLACK)
+            self.refresh_check_indicators()
 
     def show_next_move(self):
         ''' Goes forward one move in history '''
-        if self.board.current_index < len(self.board.move_history) - 1:
-            self.board.current_index += 1
+        if self.board.step_forward():
             move = self.board.move_history[self.board.current_index]
-            self.board.load_fen(move["FEN"])
-            self.sprites.build_from_board(self.board, self.square,
-                                         self.origin_x, self.origin_y,
-                                         self.game.user_color)
+            self.sprites.move_piece(self.board, move.frm, move.to, self.square,
+                                    self.origin_x, self.origin_y,
+                                    self.game.user_color)
 
             # Update check indicators for both colors
-            self.board.remove_check_indicators()
-            self.board.highlight_king_in_check(Color.WHITE)
-            self.board.highlight_king_in_check(Color.BLACK)
+            self.refresh_check_indicators()
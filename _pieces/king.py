@@ -5,6 +5,8 @@ from dataclasses import dataclass
 from _enums.piece_type import PieceType
 from _enums.color import Color
 from _pieces.piece import Piece
+from _board.attack_tables import KING_ATTACKS
+from _board.magics import bits_to_squares
 
 ### -- PYLINT NOTES -- ###
 # current_pos initialized in parent class
@@ -59,29 +61,12 @@ class King(Piece):
         Returns:
             List of legal move positions as (file, rank) tuples
         """
-        legal_moves = []
-        position = self.current_pos
-
-        # Legal moves for King
-        move_list = [(1, 0),
-                     (1, 1),
-                     (1, -1),
-                     (-1, -1),
-                     (-1, 0),
-                     (-1, 1),
-                     (0, 1),
-                     (0, -1)]
-
-        for x_offset, y_offset in move_list:
-            check_square = (position[0] + x_offset, position[1] + y_offset)
-
-            # Ensure square is within bounds and not a friendly piece
-            if 0 <= check_square[0] <= 7 and 0 <= check_square[1] <= 7:
-                tile = board.grid[check_square[1]][check_square[0]]
-
-                # See what piece is on the board; from tile.py
-                if not tile.has_piece() or tile.is_other_color(self.color):
-                    legal_moves.append((check_square[0], check_square[1]))
+        file, rank = self.current_pos
+
+        # Table lookup of the reachable squares, minus own pieces
+        attacks = (KING_ATTACKS[rank * 8 + file]
+                   & ~board.occ_color[self.color])
+        legal_moves = bits_to_squares(attacks)
 
         # Skip checking for castling if ignore checks turned on
         # Prevents recursion
@@ -91,7 +76,7 @@ class King(Piece):
         # CASTLING
         if not self.has_moved and not board.check_for_checks(self.color):
 
-            if self.color == Color.WHITE:
+            if self.color is Color.WHITE:
                 row = 0
             else:
                 row = 7
@@ -100,7 +85,7 @@ class King(Piece):
             king_rook = king_rook_tile.piece_here
 
             # Ensure rook has not moved
-            if king_rook and king_rook.piece_type == PieceType.ROOK:
+            if king_rook and king_rook.piece_type is PieceType.ROOK:
                 rook = king_rook_tile.piece_here
 
                 if not rook.has_moved:
@@ -113,7 +98,7 @@ class King(Piece):
             queen_rook = queen_rook_tile.piece_here
 
             # Ensure rook has not moved
-            if queen_rook and queen_rook.piece_type == PieceType.ROOK:
+            if queen_rook and queen_rook.piece_type is PieceType.ROOK:
                 rook = queen_rook_tile.piece_here
 
                 if not rook.has_moved:
@@ -6,6 +6,8 @@ from _enums.piece_type import PieceType
 from _enums.color import Color
 from _enums.piece_value import PieceValue
 from _pieces.piece import Piece
+from _board.attack_tables import KNIGHT_ATTACKS
+from _board.magics import bits_to_squares
 
 
 @dataclass
@@ -32,30 +34,10 @@ class Knight(Piece):
         Returns:
             List of legal move positions as (file, rank) tuples
         """
-        legal_moves = []
-        position = self.current_pos
+        file, rank = self.current_pos
 
-        # Legal moves for knight
-        move_list = [
-            (2, 1),
-            (2, -1),
-            (-2, 1),
-            (-2, -1),
-            (1, 2),
-            (1, -2),
-            (-1, 2),
-            (-1, -2)
-        ]
+        # Table lookup of the reachable squares, minus own pieces
+        attacks = (KNIGHT_ATTACKS[rank * 8 + file]
+                   & ~board.occ_color[self.color])
 
-        for x_offset, y_offset in move_list:
-            check_square = (position[0] + x_offset, position[1] + y_offset)
-
-            # Ensure square is within bounds and not a friendly piece
-            if 0 <= check_square[0] <= 7 and 0 <= check_square[1] <= 7:
-                tile = board.grid[check_square[1]][check_square[0]]
-
-                # See what piece is on the board; from tile.py
-                if not tile.has_piece() or tile.is_other_color(self.color):
-                    legal_moves.append((check_square[0], check_square[1]))
-
-        return legal_moves
+        return bits_to_squares(attacks)
@@ -6,6 +6,8 @@ from _enums.piece_type import PieceType
 from _enums.color import Color
 from _enums.piece_value import PieceValue
 from _pieces.piece import Piece
+from _board.attack_tables import PAWN_ATTACKS, PAWN_PUSHES
+from _board.magics import bits_to_squares
 
 ### -- PYLINT NOTES -- ###
 # current_pos initialized in parent class
@@ -60,64 +62,37 @@ class Pawn(Piece):
             List of legal move positions as (file, rank) tuples
         """
 
-        if self.piece_type == PieceType.PAWN:
-            legal_moves = []
-            position = self.current_pos
+        if self.piece_type is PieceType.PAWN:
+            file, rank = self.current_pos
+            square = rank * 8 + file
+            empty = ~board.occupancy
 
-            if self.color == Color.WHITE:
+            if self.color is Color.WHITE:
                 direction = 1
             else:
                 direction = -1
 
-            regular_move = (0, direction)
-            first_move = (0, 2 * direction)
-            takes = [(1, direction), (-1, direction)]
-            en_passant_moves = [(-1, 0), (1, 0)]
-
-            # Check for standard move
-            check_square = (position[0] + regular_move[0], position[1] + regular_move[1])
+            # Standard move, then the first-move double step through it
+            push = PAWN_PUSHES[self.color][square] & empty
+            if push and not self.has_moved:
+                push |= (PAWN_PUSHES[self.color][square + 8 * direction]
+                         & empty)
+            legal_moves = bits_to_squares(push)
 
-            if 0 <= check_square[0] <= 7 and 0 <= check_square[1] <= 7:
-                tile = board.grid[check_square[1]][check_square[0]]
-
-                if not tile.has_piece():
-                    legal_moves.append(check_square)
-
-            # Check for first move
-            if not self.has_moved:
-                check_square = (position[0] + first_move[0], position[1] + first_move[1])
-                check_empty = (position[0], position[1] + direction)
-
-                if 0 <= check_square[0] <= 7 and 0 <= check_square[1] <= 7:
-                    tile = board.grid[check_square[1]][check_square[0]]
-                    empty_tile = board.grid[check_empty[1]][check_empty[0]]
-
-                    if not tile.has_piece() and not empty_tile.has_piece():
-                        legal_moves.append(check_square)
-
-            # Check for takes
-            for x, y in takes:
-                check_square = (position[0] + x, position[1] + y)
-
-                # Ensure square is within bounds and not a friendly piece
-                if 0 <= check_square[0] <= 7 and 0 <= check_square[1] <= 7:
-                    tile = board.grid[check_square[1]][check_square[0]]
-
-                    # See what piece is on the board; from tile.py
-                    if tile.has_piece() and tile.is_other_color(self.color):
-                        legal_moves.append(check_square)
+            # Takes: diagonal squares holding an enemy piece
+            enemy = board.occ_color[self.color.opposite()]
+            legal_moves += bits_to_squares(PAWN_ATTACKS[self.color][square]
+                                           & enemy)
 
             # Check for en passant
-            for x, y in en_passant_moves:
-                check_square = (position[0] + x, position[1] + y)
-
-                if check_square == board.en_passant_target:
-                    legal_moves.append((check_square[0], check_square[1] + direction))
+            for x in (-1, 1):
+                if (file + x, rank) == board.en_passant_target:
+                    legal_moves.append((file + x, rank + direction))
 
             return legal_moves
-        
+
         #For promotion
-        if self.piece_type == PieceType.QUEEN:
+        if self.piece_type is PieceType.QUEEN:
             legal_moves = []
             position = self.current_pos
 
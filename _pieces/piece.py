@@ -111,7 +111,7 @@ class Piece:
         """
         Promote a pawn to a queen
         """
-        if self.piece_type == PieceType.PAWN:
+        if self.piece_type is PieceType.PAWN:
             self.piece_type = PieceType.QUEEN
             self.piece_value = PieceValue.QUEEN
 
@@ -6,6 +6,7 @@ from _enums.piece_type import PieceType
 from _enums.color import Color
 from _enums.piece_value import PieceValue
 from _pieces.piece import Piece
+from _board.magics import rook_attacks, bits_to_squares
 
 ### -- PYLINT NOTES -- ###
 # current_pos initialized in parent class
@@ -52,33 +53,10 @@ class Rook(Piece):
         Returns:
             List of legal move positions as (file, rank) tuples
         """
-        legal_moves = []
-        position = self.current_pos
+        file, rank = self.current_pos
 
-        move_list = [(-1, 0),
-                     (1, 0),
-                     (0, -1),
-                     (0, 1)]
+        # Table lookup of the attacked squares, minus own pieces
+        attacks = (rook_attacks(rank * 8 + file, board.occupancy)
+                   & ~board.occ_color[self.color])
 
-        for x_pos, y_pos in move_list:
-            counter = 1
-
-            while True:
-                check_square = position[0] + x_pos * counter, position[1] + y_pos * counter
-
-                # Ensure square is within bounds of board
-                if not (0 <= check_square[0] <= 7 and 0 <= check_square[1] <= 7):
-                    break
-
-                tile = board.grid[check_square[1]][check_square[0]]
-
-                if tile is not None and tile.has_piece():
-                    if tile.is_same_color(self.color):
-                        break
-                    legal_moves.append(check_square)
-                    break
-
-                legal_moves.append(check_square)
-                counter += 1
-
-        return legal_moves
+        return bits_to_squares(attacks)